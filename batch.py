@@ -0,0 +1,184 @@
+"""Every pairwise association between many named scales in one run.
+
+A questionnaire with a dozen constructs is described by ``{name: items}``.
+All scale scores come out of one matrix product (coerced items times a 0/1
+item-by-scale membership matrix) and all scale-by-scale correlations out of
+one call to ``correlation.pairwise_pearson`` per method. Each pair then
+takes Pearson or Spearman by the same normality rule as the single X/Y
+analysis, and the result is a tidy one-row-per-pair table:
+
+    python batch.py survey.csv --scale Trust=T1,T2,T3 --scale Loyalty=L1,L2 ...
+"""
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from correlation import correlation_pvalues, fdr_bh, pairwise_pearson, rank_columns
+from engine import (
+    AnalysisOptions,
+    corr_strength,
+    describe_matrix,
+    describe_records,
+    normality_test,
+    read_table,
+)
+from reliability import scale_reliability
+
+PAIR_COLUMNS = [
+    "Scale A", "Scale B", "Method", "r", "p-value", "FDR p-value", "n", "Strength", "Direction",
+]
+
+
+@dataclass
+class BatchResult:
+    scales: dict
+    scores: pd.DataFrame
+    options: AnalysisOptions
+    describe: pd.DataFrame = None
+    descriptives: dict = field(default_factory=dict)
+    normality_tests: dict = field(default_factory=dict)
+    reliability: dict = field(default_factory=dict)
+    pairs: pd.DataFrame = None
+    correlations: dict = field(default_factory=dict)
+
+    @property
+    def n(self):
+        return len(self.scores)
+
+    @property
+    def nbytes(self):
+        frames = [self.scores, self.describe, self.pairs]
+        return sum(int(f.memory_usage(deep=True).sum()) for f in frames if f is not None)
+
+    def summary(self):
+        return {
+            "n": self.n,
+            "scales": self.scales,
+            "reliability": {name: rel.summary() for name, rel in self.reliability.items()},
+            "pairs": self.pairs.to_dict(orient="records"),
+        }
+
+
+def parse_scale(spec):
+    """``"Name=item1,item2"`` -> ``("Name", ["item1", "item2"])``."""
+    name, sep, items = spec.partition("=")
+    if not sep or not name.strip() or not items.strip():
+        raise ValueError(f"Scale must look like NAME=ITEM,ITEM,...: {spec!r}")
+    return name.strip(), [i.strip() for i in items.split(",") if i.strip()]
+
+
+def scale_scores(df, scales):
+    """Summed score of every scale, built with a single matrix product.
+
+    Missing answers count as zero, as in ``engine.row_sum``; scores are
+    ``int64`` only when every item is a complete integer column.
+    """
+    names = list(scales)
+    items = list(dict.fromkeys(i for name in names for i in scales[name]))
+    numeric = df[items].apply(pd.to_numeric, errors="coerce")
+    X = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+
+    membership = np.zeros((len(items), len(names)))
+    position = {item: j for j, item in enumerate(items)}
+    for k, name in enumerate(names):
+        membership[[position[i] for i in scales[name]], k] = 1.0
+    scores = np.nan_to_num(X, nan=0.0) @ membership
+
+    out = pd.DataFrame(scores, index=df.index, columns=names)
+    for k, name in enumerate(names):
+        dtypes = numeric[scales[name]].dtypes
+        if all(isinstance(t, np.dtype) and t.kind in "iub" for t in dtypes):
+            out[name] = out[name].astype(np.int64)
+    return out
+
+
+def scale_correlations(scores):
+    """Pearson and Spearman r, raw p-values and pair counts for all scale pairs."""
+    S = scores.to_numpy(dtype=np.float64, na_value=np.nan)
+    out = {}
+    for method, values in [("pearson", S), ("spearman", rank_columns(S))]:
+        r, n = pairwise_pearson(values, values)
+        out[method] = {"r": r, "p": correlation_pvalues(r, n), "n": n}
+    return out
+
+
+def analyze_scales(df, scales, options=None):
+    """Scores, reliability, normality and every pairwise association of ``scales``."""
+    options = options or AnalysisOptions()
+    scales = {name: list(items) for name, items in scales.items()}
+    if len(scales) < 2:
+        raise ValueError("Batch mode needs at least two scales")
+
+    scores = scale_scores(df, scales)
+    result = BatchResult(scales=scales, scores=scores, options=options)
+    result.describe = describe_matrix(scores)
+    result.descriptives = describe_records(result.describe)
+    for name in scales:
+        result.normality_tests[name] = normality_test(
+            scores[name], result.describe.loc[name], options.normality_test
+        )
+        if len(scales[name]) >= 2:
+            result.reliability[name] = scale_reliability(df, scales[name], name)
+
+    result.correlations = scale_correlations(scores)
+    normal = np.array([result.normality_tests[name]["p"] > options.alpha for name in scales])
+    a, b = np.triu_indices(len(scales), k=1)
+    pearson = normal[a] & normal[b]
+    pick = {m: {k: v[a, b] for k, v in result.correlations[m].items()} for m in result.correlations}
+
+    r = np.where(pearson, pick["pearson"]["r"], pick["spearman"]["r"])
+    p = np.where(pearson, pick["pearson"]["p"], pick["spearman"]["p"])
+    names = np.array(list(scales), dtype=object)
+    result.pairs = pd.DataFrame({
+        "Scale A": names[a],
+        "Scale B": names[b],
+        "Method": np.where(pearson, "Pearson Correlation", "Spearman Rank Correlation"),
+        "r": r,
+        "p-value": p,
+        # One family: every pair tested in this run
+        "FDR p-value": fdr_bh(p),
+        "n": pick["pearson"]["n"],
+        "Strength": [corr_strength(v) if np.isfinite(v) else "-" for v in r],
+        "Direction": np.where(np.isfinite(r), np.where(r > 0, "Positive", "Negative"), "-"),
+    }, columns=PAIR_COLUMNS)
+    return result
+
+
+def pair_matrix(result, column="r"):
+    """Square scale-by-scale view of one column of ``result.pairs``."""
+    names = list(result.scales)
+    pos = {name: k for k, name in enumerate(names)}
+    a = result.pairs["Scale A"].map(pos).to_numpy()
+    b = result.pairs["Scale B"].map(pos).to_numpy()
+    values = np.full((len(names), len(names)), 1.0 if column == "r" else np.nan)
+    values[a, b] = values[b, a] = result.pairs[column].to_numpy(dtype=np.float64)
+    return pd.DataFrame(values, index=names, columns=names)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pairwise associations between many survey scales")
+    parser.add_argument("path", help="CSV or Excel file")
+    parser.add_argument("--scale", action="append", required=True, metavar="NAME=ITEM,ITEM",
+                        help="a named scale and its item columns (repeat for each scale)")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--csv", help="write the pair table to this CSV file instead of JSON to stdout")
+    args = parser.parse_args(argv)
+
+    try:
+        scales = dict(parse_scale(s) for s in args.scale)
+    except ValueError as exc:
+        parser.error(str(exc))
+    result = analyze_scales(read_table(args.path), scales, AnalysisOptions(alpha=args.alpha))
+    if args.csv:
+        result.pairs.to_csv(args.csv, index=False)
+        return
+    json.dump(result.summary(), sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,345 @@
+"""Benchmarks of the analysis pipeline on synthetic Likert surveys.
+
+``synthetic_survey`` draws respondents from a two-factor model: each
+respondent has a latent X and Y trait with a chosen correlation, every item
+loads on its scale's trait, and the item scores are cut into Likert
+categories at normal quantiles. Answers then go missing completely at
+random at the requested rate.
+
+Each case writes its survey to CSV bytes and times the pipeline stage by
+stage, as the ANALYSIS tab runs it: loading, composites, descriptives and
+frequency tables, normality, correlations, resampling, reliability, chart
+rendering and the PDF build. Wall time is the best of ``--repeat`` runs;
+one more run traces each stage's peak memory with ``tracemalloc``.
+Results are written as JSON, and two result files can be compared:
+
+    python bench.py run --respondents 1000 100000 --items 5 20 --output after.json
+    python bench.py compare before.json after.json --threshold 0.1
+
+``startup`` checks the app's cold start in a fresh interpreter: the first
+run of ``code.py`` without an upload must stay within a time budget and
+must not import the scientific stack, which only the ANALYSIS tab needs:
+
+    python bench.py startup --budget 1.5
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from io import BytesIO
+from itertools import product
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from engine import (
+    AnalysisOptions,
+    analyze,
+    associate,
+    association_resampling,
+    build_composites,
+    describe_matrix,
+    freq_tables,
+    normality_pvalues,
+    normality_tests,
+    scales,
+)
+from ingest import read_columns
+from instrument import max_rss_bytes
+from correlation import item_correlations
+from ordinal import ordinal_associations
+from reliability import scale_reliability
+
+BENCH_VERSION = 1
+# Stage times within this fraction of the baseline are noise, not regressions
+DEFAULT_THRESHOLD = 0.10
+# Timings shorter than this are never flagged; their ratios are mostly jitter
+MIN_SECONDS = 0.005
+# First run of the app without an upload, beyond Streamlit's own start-up
+STARTUP_BUDGET_S = 1.5
+# Loaded on the first upload, never for the landing tabs
+DEFERRED_MODULES = ["pandas", "numpy", "scipy", "matplotlib", "seaborn", "pyarrow", "reportlab"]
+
+# Runs in a fresh interpreter: Streamlit's test runner is warmed up on an
+# empty page first, so only what the app itself imports and draws is timed
+_STARTUP_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+AppTest.from_string("import streamlit as st").run()
+before = set(sys.modules)
+start = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+first_run = time.perf_counter() - start
+print(json.dumps({
+    "first_run_s": first_run,
+    "modules": sorted(set(sys.modules) - before),
+    "exception": [str(e.value) for e in at.exception],
+}))
+"""
+
+
+def synthetic_survey(respondents, x_items=5, y_items=5, missing=0.0, loading=0.7, correlation=0.3,
+                     levels=5, seed=0):
+    """Likert answers ``1..levels`` for items ``X1..``/``Y1..``, NaN where missing."""
+    rng = np.random.default_rng(seed)
+    traits = rng.multivariate_normal([0, 0], [[1, correlation], [correlation, 1]], size=respondents)
+    thresholds = stats.norm.ppf(np.linspace(0, 1, levels + 1)[1:-1])
+    unique = np.sqrt(1 - loading ** 2)
+    columns = {}
+    for prefix, k, trait in [("X", x_items, traits[:, 0]), ("Y", y_items, traits[:, 1])]:
+        scores = loading * trait[:, None] + unique * rng.standard_normal((respondents, k))
+        answers = (np.searchsorted(thresholds, scores) + 1).astype(np.float64)
+        if missing:
+            answers[rng.random(answers.shape) < missing] = np.nan
+        for j in range(k):
+            columns[f"{prefix}{j + 1}"] = answers[:, j]
+    df = pd.DataFrame(columns)
+    # read_csv gives int64 to columns without missing answers; match it
+    return df.astype({c: np.int64 for c in df.columns if not df[c].isna().any()})
+
+
+class StageTimer:
+    """Best wall time and traced peak memory per named stage.
+
+    Tracing slows allocation-heavy code (matplotlib, reportlab) several
+    times over, so memory is measured in its own pass with ``tracing`` set
+    and that pass's times are discarded.
+    """
+
+    def __init__(self):
+        self.tracing = False
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        record = self.stages.setdefault(name, {"seconds": None, "peak_bytes": None, "rows": rows})
+        if self.tracing:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            if self.tracing:
+                record["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            elif record["seconds"] is None or wall < record["seconds"]:
+                record["seconds"] = wall
+
+
+def run_case(respondents, x_items=5, y_items=5, missing=0.0, correlation=0.3, options=None,
+             repeat=3, trace_memory=True, charts=True, pdf=True, seed=0):
+    """Time every stage on one synthetic survey; returns the case record."""
+    from charts import get_figure_cache, render_distributions, scatter_png
+
+    options = options or AnalysisOptions()
+    df = synthetic_survey(respondents, x_items, y_items, missing, correlation=correlation, seed=seed)
+    xs = [c for c in df.columns if c.startswith("X")]
+    ys = [c for c in df.columns if c.startswith("Y")]
+    raw = df.to_csv(index=False).encode()
+    timer = StageTimer()
+    n = len(df)
+
+    for i in range(repeat + bool(trace_memory)):
+        timer.tracing = trace_memory and i == repeat
+        with timer.stage("load", n):
+            data, _ = read_columns(raw, "survey.csv", xs + ys)
+        with timer.stage("composites", n):
+            totals = build_composites(data, xs, ys)
+        data = pd.concat([data, totals], axis=1)
+        variables = list(data.columns)
+        with timer.stage("descriptives", n):
+            describe = describe_matrix(data, variables)
+            freq_tables(data, variables)
+        with timer.stage("normality", n):
+            normality = normality_pvalues(normality_tests(data, describe, options.normality_test))
+        with timer.stage("correlation", n):
+            association = associate(data["X_total"], data["Y_total"], normality, options.alpha)
+            item_correlations(data, xs, ys)
+            ordinal_associations(data, xs, ys)
+        with timer.stage("resampling", n):
+            association_resampling(data["X_total"], data["Y_total"], association, options)
+        with timer.stage("reliability", n):
+            for name, items in scales(xs, ys).items():
+                scale_reliability(data, items, name)
+        with timer.stage("analyze", n):
+            result = analyze(df, xs, ys, options)
+
+        if charts or pdf:
+            # Cached figures would time a lookup, not a render
+            get_figure_cache().clear()
+            with timer.stage("charts", n):
+                pngs = render_distributions(result)
+                scatter_png(result.data, pair=result.pair_stats)
+        if pdf:
+            try:
+                from report import build_report
+                with timer.stage("pdf", n):
+                    build_report(result, pngs, BytesIO())
+            except ImportError:
+                pdf = False
+
+    return {
+        "name": case_name(respondents, x_items, y_items, missing),
+        "params": {"respondents": respondents, "x_items": x_items, "y_items": y_items,
+                   "missing": missing, "correlation": correlation, "seed": seed,
+                   "resamples": options.resamples, "permutations": options.permutations},
+        "stages": timer.stages,
+        "max_rss_bytes": max_rss_bytes(),
+    }
+
+
+def case_name(respondents, x_items, y_items, missing):
+    return f"n={respondents} items={x_items}+{y_items} missing={missing:g}"
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=5).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+    }
+
+
+def startup_profile(app="code.py"):
+    """First-run time, newly imported modules and exceptions of ``app``, from a fresh interpreter."""
+    proc = subprocess.run([sys.executable, "-c", _STARTUP_PROBE, os.path.abspath(app)],
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def check_startup(app="code.py", budget=STARTUP_BUDGET_S, repeat=3):
+    """The fastest of ``repeat`` cold starts, plus the budget and import violations found."""
+    runs = [startup_profile(app) for _ in range(repeat)]
+    best = min(runs, key=lambda r: r["first_run_s"])
+    eager = sorted({m.split(".")[0] for r in runs for m in r["modules"]} & set(DEFERRED_MODULES))
+    problems = [f"{app} raised: {e}" for r in runs for e in r["exception"]]
+    if best["first_run_s"] > budget:
+        problems.append(f"first run took {best['first_run_s']:.2f}s, over the {budget:.2f}s budget")
+    if eager:
+        problems.append(f"imported before any upload: {', '.join(eager)}")
+    return {"first_run_s": best["first_run_s"], "budget_s": budget, "modules": len(best["modules"]),
+            "eager_imports": eager, "problems": problems}
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """One row per stage present in both result sets, with the time and memory ratios.
+
+    A stage regresses when it is more than ``threshold`` slower (and above
+    ``MIN_SECONDS``) or its traced peak grew by more than ``threshold``.
+    """
+    before = {case["name"]: case for case in baseline["cases"]}
+    rows = []
+    for case in current["cases"]:
+        old = before.get(case["name"])
+        if old is None:
+            continue
+        for stage, now in case["stages"].items():
+            prev = old["stages"].get(stage)
+            if prev is None or prev["seconds"] is None or now["seconds"] is None:
+                continue
+            time_ratio = now["seconds"] / prev["seconds"] if prev["seconds"] else np.nan
+            mem_ratio = (now["peak_bytes"] / prev["peak_bytes"]
+                         if now.get("peak_bytes") and prev.get("peak_bytes") else np.nan)
+            slower = time_ratio > 1 + threshold and now["seconds"] >= MIN_SECONDS
+            rows.append({
+                "case": case["name"],
+                "stage": stage,
+                "before_s": prev["seconds"],
+                "after_s": now["seconds"],
+                "time_ratio": time_ratio,
+                "before_peak": prev.get("peak_bytes"),
+                "after_peak": now.get("peak_bytes"),
+                "memory_ratio": mem_ratio,
+                "regression": bool(slower or mem_ratio > 1 + threshold),
+            })
+    return pd.DataFrame(rows)
+
+
+def _load(path):
+    with open(path) as fh:
+        return json.load(fh)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline on synthetic surveys")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time every stage over a grid of synthetic surveys")
+    run.add_argument("--respondents", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    run.add_argument("--items", type=int, nargs="+", default=[5], help="items per scale")
+    run.add_argument("--missing", type=float, nargs="+", default=[0.0], help="share of answers missing")
+    run.add_argument("--correlation", type=float, default=0.3, help="latent X/Y trait correlation")
+    run.add_argument("--resamples", type=int, default=AnalysisOptions.resamples)
+    run.add_argument("--permutations", type=int, default=0)
+    run.add_argument("--repeat", type=int, default=3, help="runs per case; the fastest is kept")
+    run.add_argument("--no-memory", action="store_true", help="skip the extra pass tracing peak memory")
+    run.add_argument("--no-charts", action="store_true", help="skip chart and PDF rendering")
+    run.add_argument("--no-pdf", action="store_true")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--output", help="JSON file to write (default: stdout)")
+
+    cmp = commands.add_parser("compare", help="compare two result files; exits 1 on a regression")
+    cmp.add_argument("baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    start = commands.add_parser("startup", help="check the app's cold start; exits 1 when over budget")
+    start.add_argument("--app", default="code.py")
+    start.add_argument("--budget", type=float, default=STARTUP_BUDGET_S, help="seconds for the first run")
+    start.add_argument("--repeat", type=int, default=3, help="cold starts; the fastest is compared")
+    args = parser.parse_args(argv)
+
+    if args.command == "startup":
+        report = check_startup(args.app, args.budget, args.repeat)
+        print(f"First run {report['first_run_s']:.2f}s (budget {report['budget_s']:.2f}s), "
+              f"{report['modules']} modules imported")
+        for problem in report["problems"]:
+            print(f"FAIL: {problem}")
+        return 1 if report["problems"] else 0
+
+    if args.command == "compare":
+        table = compare(_load(args.baseline), _load(args.current), args.threshold)
+        if table.empty:
+            print("No common cases to compare.")
+            return 0
+        with pd.option_context("display.width", 200, "display.max_rows", None):
+            print(table.round(3).to_string(index=False))
+        regressions = int(table["regression"].sum())
+        print(f"\n{regressions} of {len(table)} stage timings regressed by more than {args.threshold:.0%}.")
+        return 1 if regressions else 0
+
+    options = AnalysisOptions(resamples=args.resamples, permutations=args.permutations, seed=args.seed)
+    cases = []
+    for respondents, items, missing in product(args.respondents, args.items, args.missing):
+        case = run_case(respondents, items, items, missing, args.correlation, options, args.repeat,
+                        not args.no_memory, not args.no_charts, not (args.no_charts or args.no_pdf), args.seed)
+        cases.append(case)
+        print(f"{case['name']}: " + ", ".join(f"{s} {r['seconds']:.3f}s" for s, r in case["stages"].items()),
+              file=sys.stderr)
+    out = {"version": BENCH_VERSION, "environment": environment(), "cases": cases}
+    if args.output:
+        with open(args.output, "w") as fh:
+            json.dump(out, fh, indent=2)
+    else:
+        json.dump(out, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
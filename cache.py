@@ -0,0 +1,236 @@
+"""Content-addressed cache for parsed uploads and derived matrices.
+
+Streamlit re-executes the whole script on every widget interaction, but
+imported modules survive between reruns, so a module-level cache keyed on
+the hash of the uploaded bytes lets a rerun with the same file and
+selection skip parsing and composite construction entirely.
+"""
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from engine import build_composites
+from ingest import read_columns, read_header
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+def content_hash(*parts):
+    """Stable hex digest over bytes, strings, numbers, arrays and nested tuples/lists.
+
+    Object arrays are hashed by the text of their elements, since their raw
+    buffer holds pointers rather than values.
+    """
+    h = hashlib.blake2b(digest_size=20)
+
+    def feed(part):
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            h.update(b"b")
+            h.update(len(part).to_bytes(8, "little"))
+            h.update(part)
+        elif isinstance(part, str):
+            feed(part.encode("utf-8"))
+        elif isinstance(part, (tuple, list)):
+            h.update(b"(")
+            for p in part:
+                feed(p)
+            h.update(b")")
+        elif isinstance(part, np.ndarray) and part.dtype == object:
+            feed("object")
+            feed(part.astype(np.str_))
+        elif isinstance(part, np.ndarray):
+            feed(str(part.dtype))
+            feed(str(part.shape))
+            feed(np.ascontiguousarray(part).tobytes())
+        else:
+            feed(repr(part))
+
+    for part in parts:
+        feed(part)
+    return h.hexdigest()
+
+
+def estimate_nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, (tuple, list)):
+        # e.g. load_frame's (frame, report): sized part by part, never pickled whole
+        return sum(estimate_nbytes(v) for v in value)
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return 0
+
+
+class ResultCache:
+    """In-process LRU bounded by a byte budget, with an optional disk tier.
+
+    Entries evicted from memory are pickled into ``disk_dir`` (when set) and
+    promoted back on the next hit. Keys should come from ``content_hash``.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, disk_dir=None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @property
+    def nbytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            path = self._disk_path(key)
+            return key in self._entries or bool(path and os.path.exists(path))
+
+    def _disk_path(self, key):
+        if not self.disk_dir:
+            return None
+        return os.path.join(self.disk_dir, f"{key}.pkl")
+
+    def _spill(self, key, value):
+        path = self._disk_path(key)
+        if path is None or os.path.exists(path):
+            return
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "wb") as fh:
+                pickle.dump(value, fh, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            key, (value, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self._spill(key, value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            path = self._disk_path(key)
+            if path and os.path.exists(path):
+                try:
+                    with open(path, "rb") as fh:
+                        value = pickle.load(fh)
+                except Exception:
+                    os.remove(path)
+                else:
+                    self.hits += 1
+                    self._store(key, value)
+                    return value
+            self.misses += 1
+            return default
+
+    def _store(self, key, value, nbytes=None):
+        size = estimate_nbytes(value) if nbytes is None else nbytes
+        if key in self._entries:
+            self._bytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            # Too big for memory at all; keep it on disk only.
+            self._spill(key, value)
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        self._evict()
+
+    def put(self, key, value, nbytes=None):
+        with self._lock:
+            self._store(key, value, nbytes)
+        return value
+
+    def get_or_compute(self, key, compute):
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_shared = None
+
+
+def get_cache():
+    """Process-wide cache, sized by ANALYZER_CACHE_BYTES / ANALYZER_CACHE_DIR."""
+    global _shared
+    if _shared is None:
+        max_bytes = int(os.environ.get("ANALYZER_CACHE_BYTES", DEFAULT_MAX_BYTES))
+        _shared = ResultCache(max_bytes, os.environ.get("ANALYZER_CACHE_DIR") or None)
+    return _shared
+
+
+def load_header(raw, filename, cache=None):
+    """Hash the upload once and return ``(file_key, preview_frame)``."""
+    cache = get_cache() if cache is None else cache
+    file_key = content_hash("file", raw)
+    header = cache.get_or_compute(
+        content_hash("header", file_key), lambda: read_header(raw, filename, file_key=file_key)
+    )
+    return file_key, header
+
+
+def load_frame(raw, filename, columns=None, file_key=None, cache=None):
+    """Parse the selected columns of an upload, reusing the cached frame if seen before.
+
+    Returns ``(file_key, frame, memory_report)``; see ``ingest.read_columns``.
+    """
+    cache = get_cache() if cache is None else cache
+    file_key = file_key or content_hash("file", raw)
+    cols = None if columns is None else list(dict.fromkeys(columns))
+    df, report = cache.get_or_compute(
+        content_hash("frame", file_key, cols),
+        lambda: read_columns(raw, filename, cols, file_key=file_key),
+    )
+    return file_key, df, report
+
+
+def numeric_items(df, file_key, items, cache=None):
+    """Coerced numeric matrix for ``items`` (non-numeric cells become NaN)."""
+    cache = get_cache() if cache is None else cache
+    items = list(dict.fromkeys(items))
+    key = content_hash("items", file_key, items)
+    return cache.get_or_compute(key, lambda: df[items].apply(pd.to_numeric, errors="coerce"))
+
+
+def composites(df, file_key, x_items, y_items, cache=None):
+    """X_total / Y_total row sums over the coerced item matrix."""
+    cache = get_cache() if cache is None else cache
+    key = content_hash("composites", file_key, list(x_items), list(y_items))
+
+    def build():
+        numeric = numeric_items(df, file_key, list(x_items) + list(y_items), cache)
+        return build_composites(df, x_items, y_items, numeric)
+
+    return cache.get_or_compute(key, build)
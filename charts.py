@@ -0,0 +1,412 @@
+"""Per-variable chart rendering shared by the ANALYSIS tab and the PDF report.
+
+Each variable's histogram + boxplot figure is drawn once, to PNG bytes, on
+the Agg backend. With many variables the figures are fanned out over a
+process pool, since matplotlib/seaborn drawing is CPU-bound and holds the
+GIL. The same bytes feed ``st.image`` and reportlab's ``Image`` flowable.
+
+Rendered PNGs are kept in a content-addressed figure cache keyed on the
+plotted values and every styling parameter, so reruns and repeated report
+downloads reuse images instead of calling seaborn/matplotlib again.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from cache import ResultCache, content_hash
+from instrument import traced
+from sufficient import PairStats
+
+CHART_DPI = 150
+THEME = {"style": "whitegrid", "palette": ["#1e88e5", "#42a5f5", "#90caf9"]}
+
+# Below this many figures, worker start-up costs more than it saves
+PARALLEL_MIN_CHARTS = 4
+
+# Scatter plots switch to a binned density view above this many respondents
+SCATTER_MAX_POINTS = 20_000
+DENSITY_BINS = 60
+
+# Small multiples: at most this many segment panels, laid out this many per row
+SEGMENT_MAX_PANELS = 12
+SEGMENT_PANEL_COLUMNS = 4
+
+# Bump when drawing code changes so stale cached PNGs are not reused
+FIGURE_VERSION = 2
+FIGURE_CACHE_BYTES = 128 * 1024 * 1024
+
+_pool = None
+_figure_cache = None
+
+
+def get_figure_cache():
+    """PNG cache sized by ANALYZER_FIGURE_CACHE_BYTES, disk tier in ANALYZER_FIGURE_CACHE_DIR."""
+    global _figure_cache
+    if _figure_cache is None:
+        max_bytes = int(os.environ.get("ANALYZER_FIGURE_CACHE_BYTES", FIGURE_CACHE_BYTES))
+        _figure_cache = ResultCache(max_bytes, os.environ.get("ANALYZER_FIGURE_CACHE_DIR") or None)
+    return _figure_cache
+
+
+def figure_key(kind, *parts):
+    return content_hash("figure", FIGURE_VERSION, kind, sorted(THEME.items()), CHART_DPI, *parts)
+
+
+def apply_theme():
+    import seaborn as sns
+    sns.set_theme(**THEME)
+
+
+def _init_worker():
+    import matplotlib
+    matplotlib.use("Agg")
+    apply_theme()
+
+
+def chart_workers():
+    return int(os.environ.get("ANALYZER_CHART_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+def get_pool():
+    """Long-lived pool reused across Streamlit reruns (workers import seaborn once)."""
+    global _pool
+    if _pool is None:
+        # spawn: forking the multi-threaded Streamlit server is not safe
+        ctx = multiprocessing.get_context("spawn")
+        _pool = ProcessPoolExecutor(chart_workers(), mp_context=ctx, initializer=_init_worker)
+    return _pool
+
+
+def distribution_spec(result, col):
+    """Picklable inputs for one variable's figure."""
+    spec = {"col": col}
+    if col in result.data.columns:
+        spec["values"] = result.data[col].to_numpy(dtype=np.float64, na_value=np.nan)
+    else:
+        # Streamed items are only available as value counts
+        freq = result.frequencies[col]
+        values = pd.to_numeric(freq["Category"], errors="coerce")
+        keep = values.notna().to_numpy()
+        spec["values"] = values.to_numpy(dtype=np.float64)[keep]
+        spec["counts"] = freq["Frequency"].to_numpy()[keep]
+        desc = result.descriptives[col]
+        spec["quartiles"] = (desc["Q1 (25%)"], desc["Median"], desc["Q3 (75%)"])
+    return spec
+
+
+def plot_distribution(ax, spec):
+    import seaborn as sns
+
+    values = spec["values"]
+    if "counts" not in spec:
+        values = values[~np.isnan(values)]
+        sns.histplot(values, kde=True, ax=ax[0], color="#1e88e5")
+        sns.boxplot(x=values, ax=ax[1], color="#90caf9")
+        return
+
+    counts = spec["counts"]
+    sns.histplot(x=values, weights=counts, kde=True, ax=ax[0], color="#1e88e5")
+    q1, median, q3 = spec["quartiles"]
+    lo, hi = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    inside = values[(values >= lo) & (values <= hi)]
+    ax[1].bxp([{
+        "med": median, "q1": q1, "q3": q3,
+        "whislo": inside.min() if len(inside) else q1,
+        "whishi": inside.max() if len(inside) else q3,
+        "fliers": values[(values < lo) | (values > hi)],
+    }], orientation="horizontal", patch_artist=True, boxprops={"facecolor": "#90caf9"})
+    ax[1].set_yticks([])
+
+
+def render_distribution(spec, dpi=CHART_DPI):
+    """Histogram + boxplot for one variable as PNG bytes."""
+    import matplotlib.pyplot as plt
+
+    col = spec["col"]
+    fig, ax = plt.subplots(1, 2, figsize=(10, 3.5))
+    try:
+        plot_distribution(ax, spec)
+        ax[0].set_title(f"Distribution of {col}", fontsize=11, fontweight='bold')
+        ax[0].set_xlabel(col, fontsize=10)
+        ax[0].set_ylabel("Frequency", fontsize=10)
+        ax[1].set_title(f"Boxplot of {col}", fontsize=11, fontweight='bold')
+        ax[1].set_xlabel(col, fontsize=10)
+        fig.tight_layout()
+        buf = BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+@traced("charts")
+def render_distributions(result, columns=None, workers=None):
+    """PNG bytes for every numeric variable, keyed by column name.
+
+    Cached figures are reused; only the misses are drawn.
+    """
+    columns = [c for c in (columns or result.variables) if c in result.descriptives]
+    columns = list(dict.fromkeys(columns))
+    cache = get_figure_cache()
+    pngs, missing = {}, []
+    for col in columns:
+        spec = distribution_spec(result, col)
+        key = figure_key("distribution", sorted(spec.items()))
+        png = cache.get(key)
+        if png is None:
+            missing.append((key, spec))
+        else:
+            pngs[col] = png
+
+    specs = [spec for _, spec in missing]
+    for (key, spec), png in zip(missing, _render_many(render_distribution, specs, workers)):
+        pngs[spec["col"]] = cache.put(key, png)
+    return {col: pngs[col] for col in columns}
+
+
+def _render_many(render, specs, workers=None):
+    workers = chart_workers() if workers is None else workers
+    if workers > 1 and len(specs) >= PARALLEL_MIN_CHARTS:
+        try:
+            return list(get_pool().map(render, specs))
+        except Exception:
+            # A broken pool (e.g. killed worker) should not break the report
+            shutdown_pool()
+    return [render(spec) for spec in specs]
+
+
+def scatter_max_points():
+    return int(os.environ.get("ANALYZER_SCATTER_MAX_POINTS", SCATTER_MAX_POINTS))
+
+
+def density_grid(x, y, bins=DENSITY_BINS):
+    """2-D respondent counts over the (x, y) plane, binned in one vectorized pass.
+
+    Integer composites with a small range get one bin per score so the
+    density view keeps their exact positions.
+    """
+    def edges(v):
+        lo, hi = v.min(), v.max()
+        if np.array_equal(v, np.round(v)) and hi - lo < bins:
+            return np.arange(lo - 0.5, hi + 1.5)
+        return np.linspace(lo, hi if hi > lo else lo + 1, bins + 1)
+
+    grid, xedges, yedges = np.histogram2d(x, y, bins=[edges(x), edges(y)])
+    return grid, xedges, yedges
+
+
+def render_scatter(spec, dpi=CHART_DPI):
+    """X_total vs Y_total plot; ``report`` adds the title, grid and trend line.
+
+    Specs carrying a ``grid`` (see ``scatter_png``) are drawn as a density
+    heatmap instead of individual points.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import LogNorm
+
+    report = spec.get("report")
+    fig, ax = plt.subplots(figsize=(6, 5))
+    try:
+        if "grid" in spec:
+            grid, xedges, yedges = spec["grid"]
+            mesh = ax.pcolormesh(xedges, yedges, np.ma.masked_equal(grid.T, 0),
+                                 cmap="Blues", norm=LogNorm(vmin=1))
+            fig.colorbar(mesh, ax=ax, label="Respondents")
+            ax.annotate(f"Density view of {spec['n']:,} respondents",
+                        xy=(0.01, 0.01), xycoords="axes fraction", fontsize=8, color="#455a64")
+        elif not report:
+            ax.scatter(spec["x"], spec["y"], color="#1565c0", alpha=0.7)
+        else:
+            ax.scatter(spec["x"], spec["y"], color="#1565c0", alpha=0.7, s=60, edgecolors='white', linewidth=0.5)
+
+        if not report:
+            ax.set_xlabel("X_total")
+            ax.set_ylabel("Y_total")
+        else:
+            ax.set_xlabel("X_total", fontsize=12, fontweight='bold')
+            ax.set_ylabel("Y_total", fontsize=12, fontweight='bold')
+            ax.set_title(spec["title"], fontsize=13, fontweight='bold', pad=15)
+            ax.grid(True, alpha=0.3, linestyle='--')
+
+            xs = np.asarray(spec["x_range"])
+            ax.plot(xs, np.poly1d(spec["fit"])(xs), "r--", alpha=0.8, linewidth=2, label='Trend line')
+            ax.legend()
+            fig.tight_layout()
+        buf = BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight' if report else None)
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+@traced("scatter")
+def scatter_png(data, report=False, title=None, pair=None):
+    """Cached scatter of the composites in ``data``.
+
+    Above ``ANALYZER_SCATTER_MAX_POINTS`` respondents the points are binned
+    into a density grid, so drawing cost no longer grows with the sample.
+    The report's trend line comes from ``pair`` (a ``sufficient.PairStats``
+    of the same columns), reduced here if not given.
+    """
+    x = data["X_total"].to_numpy(dtype=np.float64, na_value=np.nan)
+    y = data["Y_total"].to_numpy(dtype=np.float64, na_value=np.nan)
+    max_points = scatter_max_points()
+    key = figure_key("scatter", x, y, report, title, max_points, DENSITY_BINS)
+
+    def render():
+        spec = {"report": report, "title": title}
+        keep = ~(np.isnan(x) | np.isnan(y))
+        if keep.sum() > max_points:
+            spec["grid"] = density_grid(x[keep], y[keep])
+            spec["n"] = int(keep.sum())
+        else:
+            spec["x"], spec["y"] = x, y
+        if report:
+            stats = pair if pair is not None else PairStats.from_arrays(x, y)
+            spec["fit"] = stats.trend()
+            spec["x_range"] = (stats.min_x, stats.max_x)
+        return render_scatter(spec)
+
+    return get_figure_cache().get_or_compute(key, render)
+
+
+def render_heatmap(spec, dpi=CHART_DPI):
+    """Item-by-item correlation heatmap; stars mark FDR-adjusted p < alpha."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    r, p_fdr = spec["r"], spec["p_fdr"]
+    rows, cols = r.shape
+    annotate = rows <= 15 and cols <= 15
+    labels = None
+    if annotate:
+        stars = np.where(p_fdr.to_numpy() < spec["alpha"], "*", "")
+        labels = np.char.add(np.char.mod("%.2f", r.to_numpy()), stars)
+
+    fig, ax = plt.subplots(figsize=(min(3 + 0.45 * cols, 24), min(2.5 + 0.4 * rows, 24)))
+    try:
+        sns.heatmap(r, ax=ax, cmap="RdBu_r", vmin=-1, vmax=1, center=0,
+                    annot=labels if annotate else False, fmt="", annot_kws={"fontsize": 8},
+                    cbar_kws={"label": f"{spec['method'].title()} r"})
+        ax.set_title(spec.get("title") or f"{spec['method'].title()} correlations: X items × Y items",
+                     fontsize=12, fontweight='bold')
+        fig.tight_layout()
+        buf = BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def heatmap_png(matrix, alpha=0.05, title=None):
+    """Cached heatmap for a ``correlation.CorrelationMatrix``."""
+    spec = {"r": matrix.r, "p_fdr": matrix.p_fdr, "method": matrix.method, "alpha": alpha, "title": title}
+    key = figure_key("heatmap", matrix.method, alpha, title, list(matrix.r.index), list(matrix.r.columns),
+                     matrix.r.to_numpy(), matrix.p_fdr.to_numpy())
+    return get_figure_cache().get_or_compute(key, lambda: render_heatmap(spec))
+
+
+def render_segment_scatter(spec, dpi=CHART_DPI):
+    """Small multiples of X_total vs Y_total, one shared-axis panel per segment."""
+    import matplotlib.pyplot as plt
+
+    panels = spec["panels"]
+    cols = min(len(panels), SEGMENT_PANEL_COLUMNS)
+    rows = -(-len(panels) // cols)
+    fig, axes = plt.subplots(rows, cols, figsize=(3.2 * cols, 2.9 * rows), sharex=True, sharey=True,
+                             squeeze=False)
+    try:
+        for ax, panel in zip(axes.ravel(), panels):
+            x, y = panel["x"], panel["y"]
+            if "grid" in panel:
+                grid, xedges, yedges = panel["grid"]
+                ax.pcolormesh(xedges, yedges, np.ma.masked_equal(grid.T, 0), cmap="Blues")
+            else:
+                ax.scatter(x, y, color="#1565c0", alpha=0.5, s=12)
+            if "fit" in panel:
+                xs = np.array(panel["x_range"])
+                ax.plot(xs, np.poly1d(panel["fit"])(xs), "r--", linewidth=1.5)
+            ax.set_title(panel["title"], fontsize=9, fontweight='bold')
+        for ax in axes.ravel()[len(panels):]:
+            ax.set_visible(False)
+        fig.supxlabel("X_total", fontsize=10)
+        fig.supylabel("Y_total", fontsize=10)
+        fig.tight_layout()
+        buf = BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def segment_scatter_png(result):
+    """Cached small-multiple scatter for a ``segments.SegmentResult``.
+
+    Only the ``SEGMENT_MAX_PANELS`` largest segments are drawn; each panel
+    switches to a density view above ``ANALYZER_SCATTER_MAX_POINTS``.
+    """
+    data = result.data[["X_total", "Y_total", result.by]].dropna(subset=["X_total", "Y_total"])
+    sizes = data[result.by].value_counts()
+    shown = [s for s in result.segments if s in sizes.index]
+    shown = sorted(shown, key=lambda s: -sizes[s])[:SEGMENT_MAX_PANELS]
+    max_points = scatter_max_points()
+
+    panels = []
+    for segment in shown:
+        block = data[data[result.by] == segment]
+        x = block["X_total"].to_numpy(dtype=np.float64)
+        y = block["Y_total"].to_numpy(dtype=np.float64)
+        r = result.associations[segment]["r"]
+        panel = {"x": x, "y": y, "title": f"{segment} (n = {len(x):,}, r = {r:.2f})"}
+        stats = PairStats.from_arrays(x, y)
+        if stats.sxx > 0:
+            panel["fit"], panel["x_range"] = stats.trend(), (stats.min_x, stats.max_x)
+        if len(x) > max_points:
+            panel["grid"] = density_grid(x, y)
+        panels.append(panel)
+
+    key = figure_key("segment-scatter", result.by, max_points, DENSITY_BINS,
+                     [(p["title"], p["x"], p["y"]) for p in panels])
+    return get_figure_cache().get_or_compute(key, lambda: render_segment_scatter({"panels": panels}))
+
+
+def render_segment_boxplots(spec, dpi=CHART_DPI):
+    """X_total and Y_total side by side as one boxplot per segment."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    frame = spec["frame"]
+    fig, ax = plt.subplots(1, 2, figsize=(11, max(3, 0.45 * frame["Segment"].nunique() + 1.5)), sharey=True)
+    try:
+        for axis, col in zip(ax, ["X_total", "Y_total"]):
+            sns.boxplot(data=frame, x=col, y="Segment", ax=axis, color="#90caf9", order=spec["order"])
+            axis.set_title(f"{col} by {spec['by']}", fontsize=11, fontweight='bold')
+        fig.tight_layout()
+        buf = BytesIO()
+        fig.savefig(buf, format='png', dpi=dpi, bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def segment_boxplot_png(result):
+    """Cached per-segment boxplots of the composites."""
+    frame = result.data[["X_total", "Y_total"]].astype(np.float64)
+    frame["Segment"] = result.data[result.by].astype(str)
+    order = [str(s) for s in result.segments]
+    codes, labels = pd.factorize(frame["Segment"])
+    key = figure_key("segment-boxplot", result.by, order, list(labels), codes,
+                     frame["X_total"].to_numpy(), frame["Y_total"].to_numpy())
+    spec = {"frame": frame, "order": order, "by": result.by}
+    return get_figure_cache().get_or_compute(key, lambda: render_segment_boxplots(spec))
+
+
+def shutdown_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
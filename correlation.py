@@ -0,0 +1,107 @@
+"""Item-by-item association matrix between the X and Y scales.
+
+Every X item is correlated with every Y item in a handful of matrix
+products instead of one ``pearsonr``/``spearmanr`` call per pair. Missing
+answers are handled pairwise: masked sums, cross-products and pair counts
+all come out of the same products, so each cell uses exactly the
+respondents who answered both items.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from counting import rank_columns
+from instrument import traced
+
+METHODS = ["pearson", "spearman"]
+
+
+@dataclass
+class CorrelationMatrix:
+    method: str
+    r: pd.DataFrame
+    p: pd.DataFrame
+    p_fdr: pd.DataFrame
+    n: pd.DataFrame
+
+    def tidy(self):
+        """One row per (X item, Y item) pair."""
+        out = pd.DataFrame({
+            "r": self.r.stack(),
+            "p-value": self.p.stack(),
+            "FDR p-value": self.p_fdr.stack(),
+            "n": self.n.stack(),
+        })
+        out.index.names = ["X item", "Y item"]
+        return out.reset_index()
+
+
+def pairwise_pearson(X, Y):
+    """Pearson r and pair counts for every column of X against every column of Y."""
+    mx, my = ~np.isnan(X), ~np.isnan(Y)
+    # Centring on the column means first keeps the sums well conditioned
+    X0 = np.where(mx, X - np.nanmean(X, axis=0), 0.0)
+    Y0 = np.where(my, Y - np.nanmean(Y, axis=0), 0.0)
+    Mx, My = mx.astype(np.float64), my.astype(np.float64)
+
+    n = Mx.T @ My
+    sx, sy = X0.T @ My, Mx.T @ Y0
+    sxx, syy = (X0 * X0).T @ My, Mx.T @ (Y0 * Y0)
+    sxy = X0.T @ Y0
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cov = sxy - sx * sy / n
+        vx = sxx - sx * sx / n
+        vy = syy - sy * sy / n
+        r = cov / np.sqrt(vx * vy)
+    return np.clip(r, -1.0, 1.0), n.astype(np.int64)
+
+
+def correlation_pvalues(r, n):
+    """Two-sided p-values from the t distribution (as pearsonr/spearmanr report)."""
+    df = n - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = r * np.sqrt(df / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(np.abs(t), df)
+    p = np.where(np.abs(r) >= 1.0, 0.0, p)
+    return np.where(df > 0, p, np.nan)
+
+
+def fdr_bh(p):
+    """Benjamini-Hochberg adjusted p-values over all finite entries of ``p``."""
+    p = np.asarray(p, dtype=np.float64)
+    flat = p.ravel()
+    ok = np.flatnonzero(~np.isnan(flat))
+    out = np.full_like(flat, np.nan)
+    if ok.size:
+        order = ok[np.argsort(flat[ok], kind="stable")]
+        m = order.size
+        scaled = flat[order] * m / np.arange(1, m + 1)
+        out[order] = np.minimum(np.minimum.accumulate(scaled[::-1])[::-1], 1.0)
+    return out.reshape(p.shape)
+
+
+@traced("item correlations")
+def item_correlations(data, x_items, y_items, methods=METHODS):
+    """``{method: CorrelationMatrix}`` for X items (rows) against Y items (columns)."""
+    x_items, y_items = list(x_items), list(y_items)
+    numeric = data[list(dict.fromkeys(x_items + y_items))].apply(pd.to_numeric, errors="coerce")
+    X = numeric[x_items].to_numpy(dtype=np.float64, na_value=np.nan)
+    Y = numeric[y_items].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    out = {}
+    for method in methods:
+        if method == "spearman":
+            r, n = pairwise_pearson(rank_columns(X), rank_columns(Y))
+        else:
+            r, n = pairwise_pearson(X, Y)
+        p = correlation_pvalues(r, n)
+
+        def frame(values):
+            return pd.DataFrame(values, index=pd.Index(x_items, name="X item"),
+                                columns=pd.Index(y_items, name="Y item"))
+
+        out[method] = CorrelationMatrix(method, frame(r), frame(p), frame(fdr_bh(p)), frame(n))
+    return out
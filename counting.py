@@ -0,0 +1,116 @@
+"""Counting-based frequency tables and ranks for small-integer columns.
+
+Likert answers, and the composites summed from them, are integers in a
+short range. For such a column the value counts are one ``bincount`` over
+its answers shifted to start at zero, with no hashing or sorting, and
+average-tie ranks follow from the same counts: a value's midrank is the
+number of answers below it plus half its own ties,
+``cumsum(counts) - (counts - 1) / 2``, so ranking is a table lookup per
+answer instead of a sort. Integer columns are counted on their native
+arrays; float columns qualify when every answer is a whole number.
+
+Columns holding fractions or text, or integers spread over more than
+``MAX_SPAN`` values, fall back to ``value_counts`` / ``scipy.stats.rankdata``.
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Widest integer range counted with bins; wider columns are sorted instead
+MAX_SPAN = 4096
+
+
+def small_int_codes(values):
+    """Zero-based codes of a 1-D array of small integers, or ``None``.
+
+    Returns ``(codes, valid, lo, span)``: ``codes`` covers the non-missing
+    entries, ``valid`` is their mask (``None`` when nothing is missing) and
+    ``lo`` the value coded as 0.
+    """
+    values = np.asarray(values)
+    valid = None
+    if values.dtype.kind == "f":
+        valid = ~np.isnan(values)
+        if valid.all():
+            valid = None
+        else:
+            values = values[valid]
+        if values.size and not (values % 1 == 0).all():
+            return None
+    elif values.dtype.kind not in "iu":
+        return None
+    if not values.size:
+        return np.empty(0, dtype=np.intp), valid, 0, 0
+    # Python scalars, so the span of a compact int8 column cannot overflow
+    lo, hi = values.min().item(), values.max().item()
+    if hi - lo + 1 > MAX_SPAN:
+        return None
+    codes = values.astype(np.intp) - int(lo)
+    return codes, valid, lo, int(hi - lo) + 1
+
+
+def midrank_table(counts):
+    """Average-tie rank of each value from its count, as in ``resampling.midranks``."""
+    return np.cumsum(counts) - (counts - 1) / 2
+
+
+def rank_columns(X):
+    """Average-tie ranks per column, NaN kept in place.
+
+    Small-integer columns are ranked from their counts; the rest go through
+    ``scipy.stats.rankdata``. Each column is ranked over its own non-missing
+    values, so with missing answers the Spearman cells approximate (rather
+    than exactly re-rank) the pairwise-complete sample.
+    """
+    X = np.asarray(X, dtype=np.float64)
+    if X.ndim == 1:
+        return rank_columns(X[:, None])[:, 0]
+    # Column-major, so each column is a contiguous slice
+    X = np.asfortranarray(X)
+    out = np.full(X.shape, np.nan)
+    for j in range(X.shape[1]):
+        coded = small_int_codes(X[:, j])
+        if coded is None:
+            out[:, j] = stats.rankdata(X[:, j], nan_policy="omit")
+            continue
+        codes, valid, _, span = coded
+        ranks = midrank_table(np.bincount(codes, minlength=span))[codes]
+        if valid is None:
+            out[:, j] = ranks
+        else:
+            out[valid, j] = ranks
+    return out
+
+
+def value_counts(data, columns):
+    """``series.value_counts(dropna=False)`` for every column, counted where possible.
+
+    Ties keep ascending value order, with missing values last.
+    """
+    out = {}
+    for col in columns:
+        series = data[col]
+        coded = None
+        if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            values = series.to_numpy()
+            if values.dtype.kind not in "iuf":
+                # Nullable dtypes: missing answers become NaN
+                values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            coded = small_int_codes(values)
+        if coded is None:
+            out[col] = series.value_counts(dropna=False)
+            continue
+
+        codes, valid, lo, span = coded
+        counts = np.bincount(codes, minlength=span)
+        present = np.flatnonzero(counts)
+        cast = int if pd.api.types.is_integer_dtype(series) else float
+        keys = [cast(lo + v) for v in present]
+        freq = counts[present]
+        missing = 0 if valid is None else int(len(valid) - valid.sum())
+        if missing:
+            keys.append(np.nan)
+            freq = np.append(freq, missing)
+        vc = pd.Series(freq, index=pd.Index(keys, dtype=object), dtype=np.int64)
+        out[col] = vc.sort_values(ascending=False, kind="stable")
+    return out
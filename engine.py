@@ -0,0 +1,509 @@
+"""Headless analysis engine behind the ANALYSIS tab.
+
+Everything here is pure pandas/scipy with no Streamlit dependency, so it can
+be imported from batch jobs and profilers, or run from the command line:
+
+    python engine.py survey.csv --x X1 X2 X3 --y Y1 Y2 Y3
+"""
+import argparse
+import json
+import sys
+import warnings
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from correlation import item_correlations
+from counting import rank_columns, value_counts
+from instrument import Recorder, recording, traced
+from ordinal import ordinal_associations
+from reliability import scale_reliability
+from sufficient import PairStats
+from resampling import DEFAULT_PERMUTATIONS, DEFAULT_RESAMPLES, DEFAULT_SEED, bootstrap_ci, permutation_test
+
+COMPOSITES = ["X_total", "Y_total"]
+# Shapiro-Wilk p-values are only reliable up to this many observations
+SHAPIRO_MAX_N = 5000
+NORMALITY_TESTS = ["auto", "shapiro", "dagostino"]
+
+
+DESCRIPTIVE_STATS = [
+    "Count", "Mean", "Median", "Std Deviation", "Variance", "Minimum", "Maximum",
+    "Skewness", "Kurtosis", "Q1 (25%)", "Q3 (75%)",
+]
+
+
+@traced("describe")
+def describe_matrix(data, columns=None):
+    """Descriptive statistics for every numeric column in one vectorized pass.
+
+    The columns are stacked into a single float matrix and reduced along the
+    row axis with NaN masking, so the cost is a handful of NumPy reductions
+    regardless of how many items are selected. Skewness and kurtosis use the
+    same bias-corrected estimators as pandas. Returns one row per column.
+    """
+    columns = list(data.columns if columns is None else columns)
+    X = data[columns].to_numpy(dtype=np.float64, na_value=np.nan) if columns else np.empty((len(data), 0))
+    mask = ~np.isnan(X)
+    n = mask.sum(axis=0)
+    nf = n.astype(np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.where(mask, X, 0.0).sum(axis=0) / nf
+        dev = np.where(mask, X - mean, 0.0)
+        dev2 = dev * dev
+        m2 = dev2.sum(axis=0)
+        m3 = (dev2 * dev).sum(axis=0)
+        m4 = (dev2 * dev2).sum(axis=0)
+        del dev, dev2
+        minimum = np.where(n > 0, np.where(mask, X, np.inf).min(axis=0, initial=np.inf), np.nan)
+        maximum = np.where(n > 0, np.where(mask, X, -np.inf).max(axis=0, initial=-np.inf), np.nan)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        quartiles = np.nanquantile(X, [0.25, 0.5, 0.75], axis=0) if X.size else np.empty((3, 0))
+
+    return moments_frame(columns, n, mean, m2, m3, m4, minimum, maximum, quartiles)
+
+
+def moments_frame(columns, n, mean, m2, m3, m4, minimum, maximum, quartiles):
+    """Descriptive table from per-column counts, means and central moment sums.
+
+    ``m2``/``m3``/``m4`` are sums of 2nd/3rd/4th powers of deviations from the
+    mean, which is what both the in-memory and streaming paths accumulate.
+    """
+    nf = np.asarray(n, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.where(n > 1, m2 / (nf - 1), np.nan)
+        pm2, pm3, pm4 = m2 / nf, m3 / nf, m4 / nf
+        g1 = pm3 / pm2 ** 1.5
+        g2 = pm4 / pm2 ** 2 - 3.0
+        skew = np.where(n > 2, np.sqrt(nf * (nf - 1)) / (nf - 2) * g1, np.nan)
+        kurt = np.where(
+            n > 3, ((nf + 1) * g2 + 6) * (nf - 1) / ((nf - 2) * (nf - 3)), np.nan
+        )
+        # Constant columns have zero spread; pandas reports 0 for both
+        skew = np.where((m2 == 0) & (n > 2), 0.0, skew)
+        kurt = np.where((m2 == 0) & (n > 3), 0.0, kurt)
+
+    q1, median, q3 = quartiles
+    table = pd.DataFrame({
+        "Count": n,
+        "Mean": mean,
+        "Median": median,
+        "Std Deviation": np.sqrt(var),
+        "Variance": var,
+        "Minimum": minimum,
+        "Maximum": maximum,
+        "Skewness": skew,
+        "Kurtosis": kurt,
+        "Q1 (25%)": q1,
+        "Q3 (75%)": q3,
+    }, index=pd.Index(list(columns), name="Variable"))
+    return table[DESCRIPTIVE_STATS]
+
+
+def describe_records(table):
+    """Per-variable ``{statistic: value}`` dicts with plain Python scalars."""
+    return {
+        col: {stat: (int(v) if stat == "Count" else float(v)) for stat, v in row.items()}
+        for col, row in table.iterrows()
+    }
+
+
+OVERVIEW_STATS = ["Count", "Mean", "Median", "Std Deviation", "Minimum", "Maximum", "Skewness"]
+
+
+def variable_overview(result):
+    """One row per analysed variable, from tables the analysis already holds.
+
+    The key descriptive statistics, the most frequent answer, the number of
+    missing answers and the Likert flag, without touching the data again.
+    """
+    # An item picked for both scales is listed once
+    variables = list(dict.fromkeys(result.variables))
+    table = pd.DataFrame(index=pd.Index(variables, name="Variable"))
+    if result.describe is not None:
+        table = table.join(result.describe[OVERVIEW_STATS])
+    freq = [result.frequencies[c] for c in variables]
+    table["Most frequent"] = [f["Category"].iloc[0] if len(f) else None for f in freq]
+    table["Missing"] = [int(f.loc[f["Category"] == "nan", "Frequency"].sum()) for f in freq]
+    table["Likert"] = [result.likert.get(c, False) for c in variables]
+    return table
+
+
+# Helper Functions
+def descriptive_numeric(series):
+    return describe_records(describe_matrix(series.to_frame()))[series.name]
+
+def freq_table(series):
+    return freq_from_counts(series.value_counts(dropna=False), len(series))
+
+@traced("frequencies")
+def freq_tables(data, columns):
+    """``freq_table`` for every column, small-integer columns counted in one pass."""
+    return {col: freq_from_counts(vc, len(data)) for col, vc in value_counts(data, columns).items()}
+
+def freq_from_counts(vc, total):
+    pct = (vc / total * 100).round(2)
+    return pd.DataFrame({
+        # Nullable dtypes label missing answers "<NA>"; keep the "nan" label
+        "Category": ["nan" if pd.isna(v) else str(v) for v in vc.index],
+        "Frequency": vc.values,
+        "Percentage (%)": pct.values
+    })
+
+def corr_strength(r):
+    r = abs(r)
+    if r < 0.2: return "Very Weak"
+    if r < 0.4: return "Weak"
+    if r < 0.6: return "Moderate"
+    if r < 0.8: return "Strong"
+    return "Very Strong"
+
+def is_likert(series):
+    vals = series.dropna().unique()
+    return all(v in [1,2,3,4,5] for v in vals)
+
+
+@traced("composites")
+def build_composites(df, x_items, y_items, numeric=None):
+    """X_total / Y_total as row sums of the numerically coerced items."""
+    if numeric is None:
+        items = list(dict.fromkeys(list(x_items) + list(y_items)))
+        numeric = df[items].apply(pd.to_numeric, errors="coerce")
+    out = pd.DataFrame(index=df.index)
+    if x_items:
+        out["X_total"] = row_sum(numeric[list(x_items)])
+    if y_items:
+        out["Y_total"] = row_sum(numeric[list(y_items)])
+    return out
+
+
+def row_sum(block):
+    """Missing-skipping row sums, accumulated in 64 bits.
+
+    Summing compact ``int8`` items directly would overflow, and pandas keeps
+    the narrow type when nullable and plain integer columns are mixed. Like
+    a default ``read_csv`` load, the total is ``int64`` only when no item
+    has missing values and ``float64`` otherwise.
+    """
+    values = block.to_numpy(dtype=np.float64, na_value=np.nan)
+    total = np.nansum(values, axis=1)
+    if all(isinstance(t, np.dtype) and t.kind in "iub" for t in block.dtypes):
+        total = total.astype(np.int64)
+    return pd.Series(total, index=block.index)
+
+
+@dataclass
+class AnalysisOptions:
+    create_total: bool = True
+    alpha: float = 0.05
+    # Bootstrap interval for the composite correlation; 0 disables it. Its cost grows
+    # with resamples times distinct (X_total, Y_total) pairs, so it is opt-in
+    resamples: int = 0
+    ci_level: float = 0.95
+    ci_method: str = "bca"
+    seed: int = DEFAULT_SEED
+    # Permutation p-value alongside the parametric one; 0 disables it
+    permutations: int = 0
+    # "auto": Shapiro-Wilk up to SHAPIRO_MAX_N observations, D'Agostino-Pearson above
+    normality_test: str = "auto"
+
+
+@dataclass
+class AnalysisResult:
+    data: pd.DataFrame
+    x_items: list
+    y_items: list
+    options: AnalysisOptions
+    variables: list = field(default_factory=list)
+    descriptives: dict = field(default_factory=dict)
+    frequencies: dict = field(default_factory=dict)
+    likert: dict = field(default_factory=dict)
+    describe: pd.DataFrame = None
+    normality: dict = field(default_factory=dict)
+    normality_tests: dict = field(default_factory=dict)
+    association: dict = None
+    item_correlations: dict = field(default_factory=dict)
+    ordinal: pd.DataFrame = None
+    # Sufficient statistics of the composite pair, shared by r, the slope and the trend line
+    pair_stats: PairStats = None
+    reliability: dict = field(default_factory=dict)
+    rows: int = None
+
+    @property
+    def n(self):
+        return len(self.data) if self.rows is None else self.rows
+
+    @property
+    def nbytes(self):
+        """Approximate footprint, used to size the result cache."""
+        frames = [self.data, self.describe, self.ordinal] + list(self.frequencies.values())
+        return sum(int(f.memory_usage(deep=True).sum()) for f in frames if f is not None)
+
+    def summary(self):
+        """JSON-friendly digest of the scalar results."""
+        def clean(d):
+            return {k: (v.item() if hasattr(v, "item") else v) for k, v in d.items()}
+
+        return {
+            "n": self.n,
+            "x_items": self.x_items,
+            "y_items": self.y_items,
+            "descriptives": {c: clean(d) for c, d in self.descriptives.items()},
+            "normality": clean(self.normality),
+            "normality_tests": {c: clean(t) for c, t in self.normality_tests.items()},
+            "reliability": {c: clean(r.summary()) for c, r in self.reliability.items()},
+            "association": clean(self.association) if self.association else None,
+        }
+
+
+def dagostino_pearson(n, skewness, kurtosis):
+    """D'Agostino-Pearson K² from a column's count, skewness and kurtosis.
+
+    Takes the bias-corrected skewness and excess kurtosis of
+    ``describe_matrix`` and follows ``scipy.stats.normaltest`` from there, so
+    large columns are tested from moments that were already computed.
+    Returns ``(K2, p)``; needs at least 8 observations.
+    """
+    n = float(n)
+    # Back to the plain moment ratios the test is defined on
+    g1 = skewness * (n - 2) / np.sqrt(n * (n - 1))
+    b2 = (kurtosis * (n - 2) * (n - 3) / (n - 1) - 6) / (n + 1) + 3
+
+    y = g1 * np.sqrt((n + 1) * (n + 3) / (6.0 * (n - 2)))
+    beta2 = 3.0 * (n * n + 27 * n - 70) * (n + 1) * (n + 3) / ((n - 2) * (n + 5) * (n + 7) * (n + 9))
+    w2 = -1 + np.sqrt(2 * (beta2 - 1))
+    delta = 1 / np.sqrt(0.5 * np.log(w2))
+    a = np.sqrt(2.0 / (w2 - 1))
+    y = y if y != 0 else 1.0
+    z_skew = delta * np.log(y / a + np.sqrt((y / a) ** 2 + 1))
+
+    mean_b2 = 3.0 * (n - 1) / (n + 1)
+    var_b2 = 24.0 * n * (n - 2) * (n - 3) / ((n + 1) ** 2 * (n + 3) * (n + 5))
+    x = (b2 - mean_b2) / np.sqrt(var_b2)
+    sqrt_beta1 = (6.0 * (n * n - 5 * n + 2) / ((n + 7) * (n + 9))
+                  * np.sqrt(6.0 * (n + 3) * (n + 5) / (n * (n - 2) * (n - 3))))
+    A = 6.0 + 8.0 / sqrt_beta1 * (2.0 / sqrt_beta1 + np.sqrt(1 + 4.0 / sqrt_beta1 ** 2))
+    denom = 1 + x * np.sqrt(2 / (A - 4.0))
+    term2 = np.sign(denom) * ((1 - 2.0 / A) / abs(denom)) ** (1 / 3.0) if denom != 0 else np.nan
+    z_kurt = (1 - 2 / (9.0 * A) - term2) / np.sqrt(2 / (9.0 * A))
+
+    k2 = z_skew ** 2 + z_kurt ** 2
+    return float(k2), float(stats.chi2.sf(k2, 2))
+
+
+def uses_dagostino(n, test="auto"):
+    """Whether ``test`` resolves to K² for ``n`` observations (it needs at least 8)."""
+    return n >= 8 and (test == "dagostino" or (test == "auto" and n > SHAPIRO_MAX_N))
+
+
+def moment_normality_test(n, moments):
+    """The D'Agostino-Pearson K² record from a column's count, skewness and kurtosis alone."""
+    k2, p = dagostino_pearson(n, moments["Skewness"], moments["Kurtosis"])
+    return {"test": "D'Agostino-Pearson K²", "n": n, "tested": n, "statistic": k2, "p": p}
+
+
+def normality_test(series, moments=None, test="auto"):
+    """Normality test suited to the sample size, as a small record.
+
+    Shapiro-Wilk is used up to ``SHAPIRO_MAX_N`` observations and
+    D'Agostino-Pearson K² above that ("auto"); ``moments`` is the column's
+    row of the descriptive table, reused by K². Forcing "shapiro" on a
+    larger column tests a reproducible random subsample of that size.
+    """
+    values = series.dropna()
+    n = len(values)
+    if n < 3:
+        return {"test": "Not enough data", "n": n, "tested": n, "statistic": np.nan, "p": 0}
+    if uses_dagostino(n, test):
+        if moments is None:
+            moments = describe_matrix(values.to_frame()).iloc[0]
+        return moment_normality_test(n, moments)
+    tested = values
+    if n > SHAPIRO_MAX_N:
+        tested = values.sample(SHAPIRO_MAX_N, random_state=0)
+    w, p = stats.shapiro(tested)
+    return {"test": "Shapiro-Wilk", "n": n, "tested": len(tested), "statistic": float(w), "p": float(p)}
+
+
+@traced("normality")
+def normality_tests(data, describe=None, test="auto"):
+    """``normality_test`` records for the composites present in ``data``."""
+    return {
+        col: normality_test(
+            data[col], describe.loc[col] if describe is not None and col in describe.index else None, test
+        )
+        for col in COMPOSITES if col in data
+    }
+
+
+def normality_pvalues(tests):
+    # Missing composites count as "not normal" so Spearman is chosen
+    return {col: tests[col]["p"] if col in tests else 0 for col in COMPOSITES}
+
+
+@traced("association")
+def associate(x, y, normality, alpha=0.05, pair=None):
+    """Pearson or Spearman association of the composites, chosen by normality.
+
+    ``pair`` is the ``PairStats`` of ``x`` and ``y`` if already reduced; r,
+    the slope and the intercept are read from it.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    pair = PairStats.from_arrays(x, y) if pair is None else pair
+
+    def ranked():
+        # Spearman r is Pearson r on the ranks of the same complete pairs
+        keep = ~(np.isnan(x) | np.isnan(y))
+        return PairStats.from_arrays(rank_columns(x[keep]), rank_columns(y[keep]))
+
+    return association_record(pair, ranked, normality, alpha)
+
+
+def association_record(pair, ranked, normality, alpha=0.05):
+    """The association entry from reduced statistics.
+
+    ``ranked`` returns the ``PairStats`` of the ranks and is only called
+    when the normality gate picks Spearman.
+    """
+    x_norm, y_norm = normality["X_total"], normality["Y_total"]
+    if x_norm > alpha and y_norm > alpha:
+        r, p = pair.pearson()
+        method = "Pearson Correlation"
+        reason = "Both variables are normally distributed and measure linear association."
+    else:
+        r, p = ranked().pearson()
+        method = "Spearman Rank Correlation"
+        reason = "Normality assumption is violated; monotonic relationship is assessed."
+    return {
+        "method": method,
+        "reason": reason,
+        "r": float(r),
+        "p": float(p),
+        "strength": corr_strength(r),
+        "direction": "Positive" if r > 0 else "Negative",
+        "n": pair.n,
+        "slope": pair.slope,
+        "intercept": pair.intercept,
+    }
+
+
+@traced("resampling")
+def association_resampling(x, y, association, options, weights=None):
+    """Bootstrap CI and permutation p-value entries for the chosen correlation.
+
+    ``weights`` count the respondents behind each (x, y) entry; the
+    bootstrap works on them directly, the permutation test on the
+    respondents they expand to.
+    """
+    method = "pearson" if association["method"].startswith("Pearson") else "spearman"
+    out = {}
+    if options.resamples:
+        out.update(bootstrap_ci(x, y, method, options.resamples, options.ci_level,
+                                options.ci_method, options.seed, weights=weights))
+    if options.permutations:
+        if weights is not None:
+            x, y = np.repeat(x, weights), np.repeat(y, weights)
+        out.update(permutation_test(x, y, method, options.permutations, options.alpha, options.seed))
+    return out
+
+
+@traced("analyze")
+def analyze(df, x_items, y_items, options=None, totals=None):
+    """Run the full descriptive + normality + association pipeline.
+
+    ``totals`` may carry precomputed composites (e.g. from ``cache.composites``)
+    to skip rebuilding them.
+    """
+    options = options or AnalysisOptions()
+    x_items, y_items = list(x_items), list(y_items)
+    data = df[list(dict.fromkeys(x_items + y_items))]
+    if options.create_total:
+        if totals is None:
+            totals = build_composites(df, x_items, y_items)
+        data = pd.concat([data, totals], axis=1)
+
+    result = AnalysisResult(data=data, x_items=x_items, y_items=y_items, options=options)
+    result.variables = [c for c in x_items + y_items + COMPOSITES if c in data.columns]
+
+    numeric = [c for c in data.columns if pd.api.types.is_numeric_dtype(data[c])]
+    result.describe = describe_matrix(data, numeric)
+    result.descriptives = describe_records(result.describe)
+    for col in result.variables:
+        if col in result.descriptives:
+            result.likert[col] = is_likert(data[col])
+    result.frequencies = freq_tables(data, result.variables)
+
+    result.normality_tests = normality_tests(data, result.describe, options.normality_test)
+    result.normality = normality_pvalues(result.normality_tests)
+    if all(c in data.columns for c in COMPOSITES):
+        result.pair_stats = PairStats.from_arrays(data["X_total"], data["Y_total"])
+        result.association = associate(
+            data["X_total"], data["Y_total"], result.normality, options.alpha, result.pair_stats
+        )
+        result.association.update(
+            association_resampling(data["X_total"], data["Y_total"], result.association, options)
+        )
+    if x_items and y_items:
+        result.item_correlations = item_correlations(data, x_items, y_items)
+        result.ordinal = ordinal_associations(data, x_items, y_items)
+    for name, items in scales(x_items, y_items).items():
+        result.reliability[name] = scale_reliability(data, items, name)
+    return result
+
+
+def scales(x_items, y_items):
+    """Multi-item scales worth a reliability estimate, keyed by their composite."""
+    return {name: items for name, items in zip(COMPOSITES, [x_items, y_items]) if len(items) >= 2}
+
+
+def read_table(path):
+    if path.endswith(".csv"):
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Descriptive & association analysis for survey data")
+    parser.add_argument("path", help="CSV or Excel file")
+    parser.add_argument("--x", nargs="+", required=True, help="X item columns")
+    parser.add_argument("--y", nargs="+", required=True, help="Y item columns")
+    parser.add_argument("--no-total", action="store_true", help="skip composite scores")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="stream a CSV in chunks of this many rows instead of loading it")
+    parser.add_argument("--resamples", type=int, nargs="?", const=DEFAULT_RESAMPLES, default=0,
+                        help="add a bootstrap CI for the correlation (default %(const)s resamples)")
+    parser.add_argument("--permutations", type=int, nargs="?", const=DEFAULT_PERMUTATIONS, default=0,
+                        help="add a permutation-test p-value (default %(const)s permutations)")
+    parser.add_argument("--normality-test", choices=NORMALITY_TESTS, default="auto")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--trace", metavar="FILE",
+                        help="write per-stage timings as a Chrome trace (chrome://tracing, Perfetto)")
+    parser.add_argument("--trace-memory", action="store_true", help="add tracemalloc byte counts to the trace")
+    args = parser.parse_args(argv)
+
+    options = AnalysisOptions(create_total=not args.no_total, alpha=args.alpha,
+                              resamples=args.resamples, permutations=args.permutations, seed=args.seed,
+                              normality_test=args.normality_test)
+    recorder = Recorder(trace_memory=args.trace_memory)
+    with recording(recorder):
+        if args.chunksize:
+            from streaming import stream_analyze
+            result = stream_analyze(args.path, args.x, args.y, options, chunksize=args.chunksize)
+        else:
+            result = analyze(read_table(args.path), args.x, args.y, options)
+    if args.trace:
+        with open(args.trace, "w") as fh:
+            fh.write(recorder.to_chrome_trace())
+    json.dump(result.summary(), sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
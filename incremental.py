@@ -0,0 +1,389 @@
+"""Incremental analysis of a survey that keeps collecting responses.
+
+An ``IncrementalState`` holds mergeable accumulators for one dataset and
+item selection: central moments and per-value counts for every item and
+composite, the co-moment matrix of each scale, the ``PairStats`` of the
+composite pair and the joint (X_total, Y_total) value counts. Folding in a
+new upload only touches its rows, and every result is then read back from
+the accumulators: quartiles from the value counts, Spearman r from
+midranks of the joint counts, reliability from the co-moments, K²
+normality from the central moments, and bootstrap intervals from the joint
+counts.
+
+An upload is a delta file of new respondents, or the growing export
+itself. When a CSV starts with the bytes of the previously applied upload,
+only the rows after them are parsed. Any other upload is parsed in full and
+its rows are compared with the rows appended so far, by a position-weighted
+sum of per-row hashes: if it starts with all of them (a re-exported xlsx,
+Parquet or Feather file, or a CSV re-saved with other line endings), only
+the rows after them are added. An upload whose first rows match the
+state's first rows but that diverges later is refused rather than counted
+twice; anything else is taken as new respondents. Uploads already applied
+are ignored, so re-running with the same file is a no-op.
+
+States are pickled under ANALYZER_STATE_DIR (empty keeps them in memory
+only), by default a private per-user folder under the system temp
+directory. A state file is only unpickled when it belongs to the current
+user and nobody else can write it:
+
+    python incremental.py wave.csv --state my_survey --x X1 X2 X3 --y Y1 Y2 Y3
+"""
+import argparse
+import json
+import os
+import pickle
+import sys
+from dataclasses import replace
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from cache import content_hash
+from counting import midrank_table
+from engine import (
+    COMPOSITES,
+    AnalysisOptions,
+    AnalysisResult,
+    association_record,
+    association_resampling,
+    build_composites,
+    describe_records,
+    moment_normality_test,
+    normality_pvalues,
+    normality_test,
+    scales,
+    uses_dagostino,
+)
+from ingest import is_csv, owned_by_user, parse_upload, private_dir
+from instrument import traced
+from reliability import reliability_from_cov
+from resampling import DEFAULT_PERMUTATIONS, DEFAULT_RESAMPLES, DEFAULT_SEED
+from streaming import CovarianceAccumulator, MomentAccumulator, ValueCounter, item_describe
+from sufficient import PairStats
+
+# Bumped whenever the pickled layout changes; older states are rebuilt
+STATE_VERSION = 2
+# Leading row hashes kept to recognise an export that restarts from the same respondents
+HEAD_ROWS = 32
+
+_STATES = {}
+
+
+class IncrementalState:
+    """Mergeable statistics of every row appended so far."""
+
+    def __init__(self, x_items, y_items):
+        self.version = STATE_VERSION
+        self.x_items, self.y_items = list(x_items), list(y_items)
+        self.items = list(dict.fromkeys(self.x_items + self.y_items))
+        self.totals = [name for name, items in zip(COMPOSITES, [self.x_items, self.y_items]) if items]
+        self.columns = self.items + self.totals
+        self.moments = MomentAccumulator(len(self.columns))
+        self.counter = ValueCounter(self.columns)
+        self.covariances = {name: CovarianceAccumulator(len(cols))
+                            for name, cols in scales(self.x_items, self.y_items).items()}
+        self.pair = PairStats()
+        # Respondents per distinct (X_total, Y_total); stays small for summed Likert items
+        self.joint = None
+        self.totals_integer = True
+        # Content hashes of the applied uploads, oldest first, and the size of the last one
+        self.uploads = []
+        self.last_bytes = 0
+        # One record per applied upload: name, rows in the file, rows added, time
+        self.history = []
+        # Hashes of the first HEAD_ROWS appended rows and the digest of all of them, in order
+        self.head = np.empty(0, dtype=np.uint64)
+        self.digest = 0
+
+    @property
+    def rows(self):
+        return self.counter.rows
+
+    @property
+    def fingerprint(self):
+        """Changes whenever rows are appended; keys cached results."""
+        return content_hash("state", self.x_items, self.y_items, self.uploads)
+
+    def update(self, frame):
+        """Fold the rows of ``frame`` into every accumulator."""
+        frame = frame[self.items]
+        numeric = frame.apply(pd.to_numeric, errors="coerce")
+        totals = build_composites(frame, self.x_items, self.y_items, numeric)
+        self.totals_integer = self.totals_integer and all(
+            pd.api.types.is_integer_dtype(totals[c]) for c in totals.columns
+        )
+
+        self.counter.update(pd.concat([frame, totals], axis=1))
+        self.moments.update(pd.concat([numeric, totals], axis=1).to_numpy(dtype=np.float64, na_value=np.nan))
+        for name, acc in self.covariances.items():
+            cols = self.x_items if name == "X_total" else self.y_items
+            acc.update(numeric[cols].to_numpy(dtype=np.float64, na_value=np.nan))
+        if len(self.totals) == 2 and len(totals):
+            self.pair.merge(PairStats.from_arrays(totals["X_total"], totals["Y_total"]))
+            joint = totals.value_counts(COMPOSITES, sort=False)
+            self.joint = joint if self.joint is None else self.joint.add(joint, fill_value=0)
+            self.joint = self.joint.astype(np.int64)
+        return self
+
+    def applied(self, raw):
+        return content_hash(raw) in self.uploads
+
+    def read_delta(self, raw, filename):
+        """``(rows not in the state yet, rows in the file)``, or None if the upload was applied.
+
+        Raises ``ValueError`` when the upload starts like the appended rows
+        but differs from them further on, so its overlap is unknown.
+        """
+        if self.applied(raw):
+            return None
+        # A re-exported CSV that extends the last upload: parse only what follows it
+        if (is_csv(filename) and self.uploads and len(raw) > self.last_bytes
+                and content_hash(raw[:self.last_bytes]) == self.uploads[-1]):
+            header = raw[:raw.index(b"\n") + 1]
+            delta = parse_upload(header + raw[self.last_bytes:], filename, self.items)
+            return delta, self.rows + len(delta)
+
+        frame = parse_upload(raw, filename, self.items)
+        if not self.rows:
+            return frame, len(frame)
+        hashes = row_hashes(frame)
+        if len(frame) >= self.rows and rows_digest(hashes[:self.rows]) == self.digest:
+            return frame.iloc[self.rows:], len(frame)
+        head = min(len(frame), len(self.head))
+        if head and np.array_equal(hashes[:head], self.head[:head]):
+            raise ValueError(
+                f"{filename} starts with the same respondents as the {self.rows:,} rows already appended but "
+                "differs from them further on, so the new rows cannot be told apart. Reset the dataset, or "
+                "upload only the new responses."
+            )
+        return frame, len(frame)
+
+    @traced("append")
+    def append(self, raw, filename):
+        """Apply an upload; returns the number of new rows."""
+        delta = self.read_delta(raw, filename)
+        if delta is None:
+            return 0
+        frame, file_rows = delta
+        hashes = row_hashes(frame)
+        if len(self.head) < HEAD_ROWS:
+            self.head = np.concatenate([self.head, hashes[:HEAD_ROWS - len(self.head)]])
+        self.digest = (self.digest + rows_digest(hashes, self.rows)) % 2 ** 64
+        self.update(frame)
+        self.uploads.append(content_hash(raw))
+        self.last_bytes = len(raw)
+        self.history.append({"Upload": filename, "Rows in file": file_rows, "Rows added": len(frame),
+                             "Added": datetime.now().strftime("%Y-%m-%d %H:%M")})
+        return len(frame)
+
+    def composite_frame(self, columns):
+        """Composite scores rebuilt from the counts, grouped by value.
+
+        Row order is lost, which none of the statistics or charts depend on.
+        """
+        dtype = np.int64 if self.totals_integer else np.float64
+        if len(columns) == 2:
+            joint = self.joint if self.joint is not None else pd.Series(
+                dtype=np.int64, index=pd.MultiIndex.from_tuples([], names=COMPOSITES))
+            counts = joint.to_numpy()
+            return pd.DataFrame({
+                c: np.repeat(joint.index.get_level_values(c).to_numpy(dtype=np.float64), counts).astype(dtype)
+                for c in columns
+            })
+        out = pd.DataFrame()
+        for c in columns:
+            values, counts = self.counter.numeric_histogram(c)
+            out[c] = np.repeat(values, counts).astype(dtype)
+        return out
+
+    def ranked_pair(self):
+        """``PairStats`` of the composites' midranks, from the joint counts."""
+        counts = self.joint.to_numpy()
+        ranks = [_midranks(self.joint.index.get_level_values(c).to_numpy(dtype=np.float64), counts)
+                 for c in COMPOSITES]
+        return PairStats.from_counts(*ranks, counts)
+
+    @traced("incremental")
+    def result(self, options=None):
+        """An ``AnalysisResult`` over all appended rows, read from the accumulators.
+
+        As in streaming mode, item-level correlations and ordinal statistics
+        need the item table and are left out.
+        """
+        options = options or AnalysisOptions()
+        totals = self.totals if options.create_total else []
+        columns = self.items + totals
+        data = self.composite_frame(totals) if totals else pd.DataFrame()
+        result = AnalysisResult(data=data, x_items=self.x_items, y_items=self.y_items, options=options,
+                                rows=self.rows)
+        result.variables = list(columns)
+
+        numeric = [c for c in columns if self.counter.numeric[c]]
+        result.describe = item_describe(numeric, self.moments, [self.columns.index(c) for c in numeric],
+                                        self.counter)
+        result.descriptives = describe_records(result.describe)
+        for c in columns:
+            result.frequencies[c] = self.counter.freq_table(c)
+            if c in result.descriptives:
+                values, _ = self.counter.numeric_histogram(c)
+                result.likert[c] = bool(np.isin(values, [1, 2, 3, 4, 5]).all())
+
+        for name, acc in self.covariances.items():
+            cols = self.x_items if name == "X_total" else self.y_items
+            result.reliability[name] = reliability_from_cov(acc.cov, acc.n, cols, name)
+
+        result.normality_tests = self.normality_tests(data, result.describe, options.normality_test)
+        result.normality = normality_pvalues(result.normality_tests)
+        if all(c in data.columns for c in COMPOSITES):
+            result.pair_stats = replace(self.pair)
+            result.association = association_record(result.pair_stats, self.ranked_pair,
+                                                    result.normality, options.alpha)
+            # The bootstrap resamples distinct pairs, so the joint counts are all it needs
+            values = [self.joint.index.get_level_values(c).to_numpy(dtype=np.float64) for c in COMPOSITES]
+            result.association.update(
+                association_resampling(*values, result.association, options, weights=self.joint.to_numpy())
+            )
+        return result
+
+    def normality_tests(self, data, describe, test="auto"):
+        """Normality records of the composites; K² comes straight from the accumulated moments."""
+        tests = {}
+        for col in COMPOSITES:
+            if col not in data:
+                continue
+            n = int(describe.loc[col, "Count"]) if col in describe.index else 0
+            if uses_dagostino(n, test):
+                tests[col] = moment_normality_test(n, describe.loc[col])
+            else:
+                tests[col] = normality_test(data[col], describe.loc[col] if col in describe.index else None, test)
+        return tests
+
+
+def row_hashes(frame):
+    """64-bit hash of every row's answers, the same whichever file format or dtypes they came in."""
+    columns = {}
+    for c in frame.columns:
+        values = frame[c]
+        numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+        text = np.isnan(numeric) & values.notna().to_numpy()
+        if text.any():
+            # Numbers and text mixed in one column: hash numbers by value, the rest by their text
+            columns[c] = np.where(text, values.astype(str).to_numpy(), numeric.astype(str))
+        else:
+            columns[c] = numeric
+    return pd.util.hash_pandas_object(pd.DataFrame(columns), index=False).to_numpy()
+
+
+def rows_digest(hashes, start=0):
+    """Order-sensitive digest of rows ``start, start + 1, ...``; digests of consecutive runs add up."""
+    weights = 2 * np.arange(start, start + len(hashes), dtype=np.uint64) + np.uint64(1)
+    return int(np.sum(hashes * weights, dtype=np.uint64))
+
+
+def _midranks(values, counts):
+    """Average-tie rank of each distinct value weighted by its count."""
+    uniq, inverse = np.unique(values, return_inverse=True)
+    return midrank_table(np.bincount(inverse, weights=counts, minlength=len(uniq)))[inverse]
+
+
+def state_dir():
+    return private_dir("state", "ANALYZER_STATE_DIR")
+
+
+def state_key(dataset, x_items, y_items):
+    return content_hash("incremental", dataset, list(x_items), list(y_items))
+
+
+def state_path(key):
+    directory = state_dir()
+    return os.path.join(directory, f"{key}.pkl") if directory else None
+
+
+def open_state(dataset, x_items, y_items):
+    """The saved state of ``dataset`` for this item selection, or an empty one."""
+    key = state_key(dataset, x_items, y_items)
+    state = _STATES.get(key)
+    path = state_path(key)
+    # Unpickling runs code, so only files this user wrote and others cannot replace
+    if state is None and path and os.path.exists(path) and owned_by_user(path, others=0o022):
+        try:
+            with open(path, "rb") as fh:
+                state = pickle.load(fh)
+        except Exception:
+            state = None
+        if getattr(state, "version", None) != STATE_VERSION:
+            state = None
+    if state is None:
+        state = IncrementalState(x_items, y_items)
+    _STATES[key] = state
+    return state
+
+
+def save_state(dataset, state):
+    """Keep ``state`` for the session and, when a state directory is set, on disk."""
+    key = state_key(dataset, state.x_items, state.y_items)
+    _STATES[key] = state
+    path = state_path(key)
+    if path is None:
+        return False
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        with open(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), "wb") as fh:
+            pickle.dump(state, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+
+
+def reset_state(dataset, x_items, y_items):
+    key = state_key(dataset, x_items, y_items)
+    _STATES.pop(key, None)
+    path = state_path(key)
+    if path and os.path.exists(path):
+        os.remove(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Append new survey responses to a saved analysis state")
+    parser.add_argument("paths", nargs="*", help="CSV or Excel files with new responses, applied in order")
+    parser.add_argument("--state", required=True, help="dataset name the state is saved under")
+    parser.add_argument("--x", nargs="+", required=True, help="X item columns")
+    parser.add_argument("--y", nargs="+", required=True, help="Y item columns")
+    parser.add_argument("--reset", action="store_true", help="discard the saved state first")
+    parser.add_argument("--no-total", action="store_true", help="skip composite scores")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--resamples", type=int, nargs="?", const=DEFAULT_RESAMPLES, default=0,
+                        help="add a bootstrap CI for the correlation (default %(const)s resamples)")
+    parser.add_argument("--permutations", type=int, nargs="?", const=DEFAULT_PERMUTATIONS, default=0,
+                        help="add a permutation-test p-value (default %(const)s permutations)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+
+    if args.reset:
+        reset_state(args.state, args.x, args.y)
+    state = open_state(args.state, args.x, args.y)
+    added = {}
+    for path in args.paths:
+        with open(path, "rb") as fh:
+            try:
+                added[path] = state.append(fh.read(), path)
+            except ValueError as exc:
+                # Keep what the earlier files added
+                save_state(args.state, state)
+                parser.error(str(exc))
+    save_state(args.state, state)
+
+    options = AnalysisOptions(create_total=not args.no_total, alpha=args.alpha, resamples=args.resamples,
+                              permutations=args.permutations, seed=args.seed)
+    summary = {"added": added, **state.result(options).summary()}
+    json.dump(summary, sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Column-pruned, dtype-aware loading of uploaded survey files.
+
+The upload is first sniffed for its header so the user can pick items, and
+only the selected columns are then parsed. Integer-valued columns (Likert
+answers in particular) are stored in the narrowest integer type that holds
+them, using pandas' nullable ``Int8``/``Int16``/... when answers are missing.
+
+When pyarrow is installed, a CSV/Excel upload is converted once into an
+uncompressed Feather file named by its content hash. Later sessions read the
+header from its schema and the selected columns through a memory map, so
+repeat analyses never go back through ``read_csv``/``read_excel``. Parquet
+and Feather files can also be uploaded directly.
+
+The Feather files hold respondent data, so they go to a private per-user
+folder under the temp directory (or ANALYZER_COLUMNAR_DIR; set it empty to
+turn the cache off). The least recently used files are deleted once the
+folder exceeds ANALYZER_COLUMNAR_BYTES.
+"""
+import getpass
+import os
+import stat
+import tempfile
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:  # columnar cache and Parquet/Feather uploads are disabled
+    pa = None
+
+PREVIEW_ROWS = 5
+COLUMNAR_TYPES = ["parquet", "feather"]
+COLUMNAR_MAX_BYTES = 2 * 1024 ** 3
+
+_INT_TYPES = [
+    (np.int8, "Int8"),
+    (np.int16, "Int16"),
+    (np.int32, "Int32"),
+]
+
+
+def private_dir(name, variable):
+    """Directory for files only this user may see, or None to keep them in memory.
+
+    ``variable`` names the environment setting that overrides it (empty
+    disables the files). The default is ``name`` under a per-user folder of
+    the temp directory, created with mode 0700 and used only while both
+    belong to the current user and are closed to everyone else.
+    """
+    directory = os.environ.get(variable)
+    if directory is not None:
+        return directory or None
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    base = os.path.join(tempfile.gettempdir(), f"analyzer-{user}")
+    directory = os.path.join(base, name)
+    try:
+        # makedirs applies the mode to the leaf only
+        for path in (base, directory):
+            if not os.path.isdir(path):
+                os.mkdir(path, 0o700)
+    except OSError:
+        return None
+    return directory if owned_by_user(base) and owned_by_user(directory) else None
+
+
+def owned_by_user(path, others=0o077):
+    """True when ``path`` is no symlink, belongs to the current user and has none of the ``others`` mode bits."""
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    if not hasattr(os, "getuid"):
+        # No POSIX owners; the temp directory is per-user on Windows
+        return True
+    return not stat.S_ISLNK(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & others
+
+
+def is_csv(filename):
+    return filename.endswith(".csv")
+
+
+def is_columnar(filename):
+    return filename.rsplit(".", 1)[-1] in COLUMNAR_TYPES
+
+
+def columnar_max_bytes():
+    return int(os.environ.get("ANALYZER_COLUMNAR_BYTES", COLUMNAR_MAX_BYTES))
+
+
+def columnar_cache_path(file_key):
+    """Feather cache file for an upload, or None when the cache is unavailable.
+
+    The directory comes from ANALYZER_COLUMNAR_DIR (empty disables the cache)
+    and defaults to a private per-user folder under the system temp directory.
+    """
+    if pa is None or not file_key:
+        return None
+    directory = private_dir("columnar", "ANALYZER_COLUMNAR_DIR")
+    return os.path.join(directory, f"{file_key}.feather") if directory else None
+
+
+def cached_columnar(path):
+    """True when the cache file exists; marks it as recently used for eviction."""
+    try:
+        os.utime(path)
+        return True
+    except OSError:
+        return False
+
+
+def write_columnar(df, path):
+    """Best-effort Feather write; the cache is an optimization, never an error."""
+    if not all(isinstance(c, str) for c in df.columns):
+        return False
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        os.close(os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600))
+        feather.write_feather(df.reset_index(drop=True), tmp, compression="uncompressed")
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        return False
+    evict_columnar(os.path.dirname(path), columnar_max_bytes(), keep=path)
+    return True
+
+
+def evict_columnar(directory, max_bytes, keep=None):
+    """Delete the least recently used Feather files until ``directory`` fits in ``max_bytes``.
+
+    Readers that have a file memory-mapped keep their mapping after it is
+    deleted. ``keep`` (the file just written) is never removed.
+    """
+    files = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith(".feather"):
+            try:
+                info = entry.stat()
+            except OSError:
+                continue
+            files.append((info.st_mtime, info.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+    return total
+
+
+def read_columnar(source, filename=".feather", columns=None, nrows=None):
+    """Selected columns of a Feather/Parquet file path or in-memory payload."""
+    if isinstance(source, (bytes, bytearray)):
+        source = pa.BufferReader(source)
+    if filename.endswith(".parquet"):
+        pf = pq.ParquetFile(source)
+        if nrows is not None:
+            batch = next(pf.iter_batches(batch_size=nrows, columns=columns), None)
+            return batch.to_pandas() if batch is not None else pf.schema_arrow.empty_table().to_pandas()
+        table = pf.read(columns=columns)
+    else:
+        table = feather.read_table(source, columns=columns, memory_map=isinstance(source, str))
+        if nrows is not None:
+            table = table.slice(0, nrows)
+    return table.to_pandas()
+
+
+def parse_upload(raw, filename, usecols=None, nrows=None):
+    buf = BytesIO(raw)
+    if is_columnar(filename):
+        return read_columnar(raw, filename, usecols, nrows)
+    if is_csv(filename):
+        return pd.read_csv(buf, usecols=usecols, nrows=nrows)
+    return pd.read_excel(buf, usecols=usecols, nrows=nrows)
+
+
+def read_header(raw, filename, nrows=PREVIEW_ROWS, file_key=None):
+    """Column names plus a few preview rows, without parsing the whole file."""
+    path = columnar_cache_path(file_key)
+    if path and cached_columnar(path):
+        return read_columnar(path, nrows=nrows)
+    return parse_upload(raw, filename, nrows=nrows)
+
+
+def read_columns(raw, filename, columns=None, compact=True, file_key=None):
+    """Load only ``columns`` (all when None); returns ``(frame, memory_report)``.
+
+    With a ``file_key`` and pyarrow available, CSV/Excel uploads are parsed
+    in full once, compacted and written to the columnar cache; every later
+    call memory-maps just the requested columns from it.
+    """
+    usecols = list(dict.fromkeys(columns)) if columns is not None else None
+    path = columnar_cache_path(file_key)
+    if path and cached_columnar(path):
+        df = read_columnar(path, columns=usecols)
+    elif path and not is_columnar(filename):
+        full = parse_upload(raw, filename)
+        if compact:
+            full = compact_dtypes(full)
+        write_columnar(full, path)
+        df = full[usecols] if usecols is not None else full
+        del full
+    else:
+        df = parse_upload(raw, filename, usecols)
+    if usecols is not None:
+        df = df[usecols]
+    if compact:
+        df = compact_dtypes(df)
+    return df, {"columns": len(df.columns), "bytes_inferred": default_nbytes(df), "bytes": frame_nbytes(df)}
+
+
+def frame_nbytes(df):
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def default_nbytes(df):
+    """Size the frame would have with pandas' default 64-bit numeric types."""
+    total = int(df.index.memory_usage(deep=True))
+    for c in df.columns:
+        if pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c]):
+            total += 8 * len(df)
+        else:
+            total += int(df[c].memory_usage(index=False, deep=True))
+    return total
+
+
+def compact_integer(series):
+    """Narrowest (nullable, if needed) integer dtype for an integer-valued column.
+
+    Returns the series unchanged when it holds fractional values or does not
+    fit in 32 bits.
+    """
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series
+    values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+    present = values[~np.isnan(values)]
+    if present.size and not np.array_equal(present, np.floor(present)):
+        return series
+    lo, hi = (present.min(), present.max()) if present.size else (0, 0)
+    has_na = present.size < values.size
+    for np_type, nullable in _INT_TYPES:
+        info = np.iinfo(np_type)
+        if info.min <= lo and hi <= info.max:
+            return series.astype(nullable if has_na else np_type)
+    return series
+
+
+def compact_dtypes(df):
+    return pd.DataFrame({c: compact_integer(df[c]) for c in df.columns}, index=df.index)
+
+
+def format_bytes(n):
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
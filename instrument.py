@@ -0,0 +1,192 @@
+"""Per-stage timing and memory records for the analysis pipeline.
+
+Stages are marked with ``span`` (a context manager) or ``traced`` (a
+decorator). Both cost one context-variable lookup when nothing is
+recording. Inside ``recording(recorder)`` every span adds a record with:
+- wall and CPU time;
+- the row count of its first argument, for decorated functions;
+- the growth of the process's peak RSS, where the platform reports it;
+- when the recorder traces memory, the bytes ``tracemalloc`` saw
+  allocated (net and peak).
+Spans nest, and each record names its parent.
+
+CPU time is ``time.process_time``, so it includes other threads of the
+process. Chart workers run in separate processes and are not counted.
+
+A ``Recorder`` exports its spans as JSON lines, or as a Chrome trace that
+chrome://tracing and Perfetto open, for offline profiling:
+
+    python engine.py survey.csv --x X1 X2 --y Y1 Y2 --trace trace.json
+"""
+import contextvars
+import functools
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+SPAN_COLUMNS = ["name", "depth", "rows", "wall_s", "cpu_s", "alloc_bytes", "peak_bytes", "rss_growth_bytes"]
+
+_recorder = contextvars.ContextVar("analyzer_recorder", default=None)
+_parent = contextvars.ContextVar("analyzer_span", default=None)
+
+
+def max_rss_bytes():
+    """Peak resident set size of this process so far, or None where it is not reported (Windows)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return int(rss if sys.platform == "darwin" else rss * 1024)
+
+
+class Recorder:
+    """Collects span records; safe to share with worker threads."""
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.spans = []
+        self.origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._ids = 0
+        self._started_tracing = False
+
+    def start(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+
+    def stop(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def next_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids - 1
+
+    def add(self, record):
+        with self._lock:
+            self.spans.append(record)
+
+    def table(self):
+        """One row per span, in start order, names indented by depth."""
+        spans = sorted(self.spans, key=lambda s: s["start_s"])
+        table = pd.DataFrame(spans, columns=SPAN_COLUMNS + ["start_s", "attrs"])
+        table["name"] = [
+            "  " * d + n + (f" [{', '.join(f'{k}={v}' for k, v in a.items())}]" if a else "")
+            for n, d, a in zip(table["name"], table["depth"], table["attrs"])
+        ]
+        return table[SPAN_COLUMNS]
+
+    def to_jsonl(self):
+        return "".join(json.dumps(s, default=str) + "\n" for s in self.spans)
+
+    def to_chrome_trace(self):
+        """Complete ("X") events in the Chrome trace event format."""
+        pid = os.getpid()
+        events = [
+            {
+                "name": s["name"], "cat": "analysis", "ph": "X", "pid": pid, "tid": s["thread"],
+                "ts": round(s["start_s"] * 1e6), "dur": round(s["wall_s"] * 1e6),
+                "args": {k: s[k] for k in ("rows", "cpu_s", "alloc_bytes", "peak_bytes", "rss_growth_bytes")}
+                | s["attrs"],
+            }
+            for s in self.spans
+        ]
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str)
+
+
+@contextmanager
+def recording(recorder):
+    """Record the spans opened in this context (and contexts copied from it)."""
+    token = _recorder.set(recorder)
+    recorder.start()
+    try:
+        yield recorder
+    finally:
+        recorder.stop()
+        _recorder.reset(token)
+
+
+def activate(recorder):
+    """Make ``recorder`` (or None) the active one until the next call.
+
+    For scripts that cannot wrap their body in ``recording``, such as a
+    Streamlit page that may ``st.stop()`` halfway: each rerun activates
+    its own recorder, and the previous one stops tracing.
+    """
+    previous = _recorder.get()
+    if previous is not None and previous is not recorder:
+        previous.stop()
+    _recorder.set(recorder)
+    if recorder is not None:
+        recorder.start()
+    return recorder
+
+
+@contextmanager
+def span(name, rows=None, **attrs):
+    """Time the enclosed block; yields its record (or None when not recording)."""
+    recorder = _recorder.get()
+    if recorder is None:
+        yield None
+        return
+    parent = _parent.get()
+    tracing = recorder.trace_memory and tracemalloc.is_tracing()
+    record = {
+        "name": name, "parent": parent["id"] if parent else None,
+        "depth": parent["depth"] + 1 if parent else 0, "rows": rows, "attrs": attrs,
+        "thread": threading.get_ident(), "peak_seen": 0,
+    }
+    if tracing:
+        current, peak = tracemalloc.get_traced_memory()
+        if parent is not None:
+            parent["peak_seen"] = max(parent["peak_seen"], peak)
+        tracemalloc.reset_peak()
+        record["alloc_start"] = current
+    rss = max_rss_bytes()
+    wall, cpu = time.perf_counter(), time.process_time()
+    record["start_s"] = wall - recorder.origin
+    # Assigned on entry, so nested spans can name their parent
+    record["id"] = recorder.next_id()
+    token = _parent.set(record)
+    try:
+        yield record
+    finally:
+        _parent.reset(token)
+        record["wall_s"] = time.perf_counter() - wall
+        record["cpu_s"] = time.process_time() - cpu
+        record["rss_growth_bytes"] = max_rss_bytes() - rss if rss is not None else None
+        record["alloc_bytes"] = record["peak_bytes"] = None
+        if tracing and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(record["peak_seen"], peak)
+            record["alloc_bytes"] = current - record["alloc_start"]
+            record["peak_bytes"] = peak - record["alloc_start"]
+            if parent is not None:
+                parent["peak_seen"] = max(parent["peak_seen"], peak)
+        recorder.add({k: v for k, v in record.items() if k not in ("peak_seen", "alloc_start")})
+
+
+def traced(name):
+    """Decorator form of ``span``; rows are the length of a frame or array first argument."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _recorder.get() is None:
+                return func(*args, **kwargs)
+            first = args[0] if args else None
+            rows = len(first) if hasattr(first, "shape") else None
+            with span(name, rows):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,453 @@
+"""HOME and INTRODUCTION tabs.
+
+Their content never changes, so the cards and long-form text are built
+once, when Streamlit first imports this module, and each rerun only sends
+the finished markup. Nothing here imports the scientific stack: the
+landing tabs paint before pandas, SciPy or matplotlib are loaded, which
+happens on the first upload in the ANALYSIS tab.
+"""
+import random
+
+import streamlit as st
+
+QUOTES = [
+    "Without data, you're just another person with an opinion. - W. Edwards Deming",
+    "Data is a precious thing and will last longer than the systems themselves. - Tim Berners-Lee",
+    "The goal is to turn data into information, and information into insight. - Carly Fiorina",
+    "In God we trust. All others must bring data. - W. Edwards Deming",
+    "Data really powers everything that we do. - Jeff Weiner"
+]
+
+FEATURES = [
+    ("📋", "Descriptive Statistics", "Mean, median, variance, etc."),
+    ("🔗", "Spearman Correlation", "For ordinal data analysis"),
+    ("📊", "Data Visualization", "Interactive charts & plots"),
+    ("📈", "Regression Analysis", "Trend lines & predictions"),
+    ("🎯", "Statistical Testing", "p-values & significance"),
+    ("📊", "Correlation Matrix", "Multi-variable relationships")
+]
+
+TECH_STACK = [
+    {"icon": "🐍", "name": "Python 3.11+", "desc": "Core programming language for data analysis and backend logic"},
+    {"icon": "🐼", "name": "Pandas", "desc": "Powerful data manipulation and analysis library for structured data"},
+    {"icon": "📊", "name": "Plotly", "desc": "Interactive graphing library for creating professional visualizations"},
+    {"icon": "⚡", "name": "Streamlit", "desc": "Rapid web application development framework for interactive dashboards"},
+    {"icon": "🔢", "name": "NumPy", "desc": "Fundamental package for numerical computing and array operations"},
+    {"icon": "🔬", "name": "SciPy", "desc": "Scientific computing library with advanced statistical functions"},
+]
+
+TEAM_MEMBERS = [
+    {
+        "name": "Hevita Zhofany Putri",
+        "role": "Data Analyst",
+        "id": "004202400016",
+        "icon": "📈",
+        "color": "#4CAF50"
+    },
+    {
+        "name": "Ristia Angelina Purba",
+        "role": "Data Scientist",
+        "id": "004202400071",
+        "icon": "👩‍🔬",
+        "color": "#2196F3"
+    },
+    {
+        "name": "Mika Lusia Panjaitan",
+        "role": "Statistical Systems Developer",
+        "id": "004202400101",
+        "icon": "👩‍💻",
+        "color": "#FF9800"
+    },
+    {
+        "name": "Sarah Aulya Fitri Ritonga",
+        "role": "Project Manager",
+        "id": "004202400090",
+        "icon": "👩‍💼",
+        "color": "#9C27B0"
+    }
+]
+
+
+def _feature_card(icon, title, desc):
+    return f"""
+    <div class="glass-card">
+        <div style="font-size: 1.8rem; margin-bottom: 8px;">{icon}</div>
+        <h4 style="color: white; margin: 0 0 5px 0;">{title}</h4>
+        <p style="color: rgba(255, 255, 255, 0.8); font-size: 0.9rem; margin: 0;">{desc}</p>
+    </div>
+    """
+
+
+def _tech_card(tech):
+    return f"""
+    <div class="tech-card">
+        <div style="font-size: 2rem; margin-bottom: 1rem; color: #2196f3;">{tech['icon']}</div>
+        <h4 style="margin-bottom: 0.5rem;">{tech['name']}</h4>
+        <p style="color: #666; margin: 0;">{tech['desc']}</p>
+    </div>
+    """
+
+
+def _team_card(member):
+    return f"""
+    <div class="team-member-card" style="border-top-color: {member['color']};">
+        <div style="display: flex; align-items: center; gap: 1.5rem;">
+            <div class="team-member-icon" style="background: linear-gradient(135deg, {member['color']}, {member['color']}dd);">
+                {member['icon']}
+            </div>
+            <div style="flex: 1;">
+                <div style="font-size: 1.4rem; font-weight: 700; color: {member['color']}; margin-bottom: 0.5rem;">
+                    {member['name']}
+                </div>
+                <div style="font-size: 1.1rem; font-weight: 600; color: #666; margin-bottom: 0.5rem;">
+                    {member['role']}
+                </div>
+                <div style="color: #999; font-size: 0.95rem;">Student ID: {member['id']}</div>
+            </div>
+        </div>
+    </div>
+    """
+
+
+FEATURE_CARDS = [_feature_card(*feature) for feature in FEATURES]
+TECH_CARDS = [_tech_card(tech) for tech in TECH_STACK]
+TEAM_CARDS = [_team_card(member) for member in TEAM_MEMBERS]
+
+DIVIDER = '<div style="height: 3px; background: linear-gradient(90deg, #2196f3, #00bcd4, #2196f3); margin: 3rem 0; border-radius: 3px; opacity: 0.7;"></div>'
+
+ABOUT_ANALYSIS = """
+## 📊 About the Analysis
+
+This application performs two major statistical procedures on the survey data:
+
+1. **Descriptive Analysis**, which summarizes and explains the characteristics of each item and of each variable (X and Y).  
+2. **Association Analysis (Spearman Correlation)**, which evaluates the strength and direction of the relationship between the two variables.
+
+### 1) Descriptive Analysis — Complete Explanation
+
+Descriptive analysis provides a detailed summary of the survey results, helping users understand the overall shape, tendencies, and variability of the data without making statistical predictions.  
+Below are the components included in this application:
+
+#### A. Basic Statistics (per item and per variable)
+
+- **Mean (Average)**: The central tendency of the responses; calculated by dividing the total score by the number of respondents.  
+- **Median**: The middle value of the sorted responses; more stable against extreme values.  
+- **Mode**: The most frequently appearing score — especially useful for Likert-scale items.  
+- **Minimum & Maximum**: Lowest and highest observed values.  
+- **Range**: The difference between maximum and minimum.  
+- **Standard Deviation (SD)**: Measures how much the responses vary from the mean — higher SD = more spread.  
+- **Quartiles / Percentiles (25%, 50%, 75%)**: Show how responses are distributed across the entire range.
+
+#### B. Distribution & Frequency
+
+- **Frequency table**: Shows how many respondents choose each scale point (e.g., 1–5).  
+- **Histogram**: Visualizes the shape of the data — skewed, symmetric, or multimodal.  
+- **Bar chart (frequency)**: Best for Likert-scale data or categorical responses.
+
+#### C. Variable-Level Summaries
+
+- **Boxplot**: Displays median, quartiles, and outliers of the total scores (X TOTAL, Y TOTAL).  
+- **Heatmap (optional)**: Shows relationships between items within or across variables.
+
+#### D. Data Quality Indicators (optional)
+
+- **Missing-value proportion**: Ensures data completeness.  
+- **Reliability (e.g., Cronbach's Alpha)**: Measures internal consistency of each variable (optional but recommended).
+
+### 2) Association Analysis Between Variables X and Y
+
+After calculating total scores for each variable (combining the 10 items into X and Y scores), the application performs an association analysis to evaluate the **relationship between the two variables**.
+
+#### Elements of the Association Analysis
+
+- **Spearman Correlation Coefficient (ρ)**: Measures the strength and direction of a monotonic relationship.  
+- **p-value**: Determines whether the correlation is statistically significant.  
+- **Automatic interpretation**: Classifies ρ as very weak, weak, moderate, strong, or very strong.  
+- **Scatter Plot (X TOTAL vs. Y TOTAL)**: Visualizes the monotonic pattern between the two variables.  
+- **Heatmap (optional)**: Shows the correlation between all items or between the two variables.
+
+#### Diagrams Used & Their Functions
+
+- **Scatter Plot**: Shows whether higher X values correspond to higher (or lower) Y values.  
+- **Trendline (optional)**: Helps visualize the general direction of the relationship.  
+- **Heatmap**: Convenient for evaluating multiple correlations at once.  
+- **Boxplot**: Can show how one variable behaves across categories of the other (optional).
+
+### 4) Interpretation Guide
+
+- **ρ > 0**: Positive relationship (higher X tends to accompany higher Y).  
+- **ρ < 0**: Negative relationship (higher X tends to accompany lower Y).  
+- **|ρ| < 0.2**: Very weak or negligible relationship.  
+- **p < 0.05**: Statistically significant — unlikely to occur by chance.  
+Always combine statistical results with conceptual understanding — significance ≠ practical importance.
+
+## 🎯 Objectives of This Program
+
+This program was developed with the following objectives:
+
+1. **Provide complete descriptive statistics** for each item and both variables.  
+2. **Display interactive visualizations** such as histograms, boxplots, scatter plots, and heatmaps.  
+3. **Measure the association** between variables X and Y using Spearman correlation.  
+4. **Generate interpretable insights** that can support academic reports or decision-making.  
+5. **Allow users to upload their own survey data**, making the tool flexible and general-purpose.
+"""
+
+
+def render_home():
+    # Background gradient styling for home page
+    st.markdown("""
+    <style>
+        [data-testid="stAppViewContainer"] {
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        }
+        .glass-card {
+            background: rgba(255, 255, 255, 0.15);
+            backdrop-filter: blur(10px);
+            border-radius: 15px;
+            padding: 20px;
+            margin: 10px 0;
+            border: 1px solid rgba(255, 255, 255, 0.2);
+        }
+        .quote-card {
+            background: rgba(255, 255, 255, 0.1);
+            border-left: 4px solid #FFD700;
+            padding: 15px;
+            border-radius: 10px;
+            font-style: italic;
+        }
+    </style>
+    """, unsafe_allow_html=True)
+
+    # Title section
+    st.markdown('<div style="text-align: center; padding: 20px;">', unsafe_allow_html=True)
+    st.markdown('<h1 style="color: white; font-size: 3rem; margin-bottom: 10px;">📊 Data Analytics Platform</h1>', unsafe_allow_html=True)
+    st.markdown('<p style="color: white; font-size: 1.3rem;">Complete Statistical Analysis Solution for Researchers</p>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # One quote per session, so it does not change on every rerun
+    quote = st.session_state.setdefault("home_quote", random.choice(QUOTES))
+    st.markdown(f"""
+    <div class="quote-card">
+        <p style="color: white; margin: 0; font-size: 1.1rem;">"{quote.split(' - ')[0]}"</p>
+        <p style="color: rgba(255, 255, 255, 0.7); text-align: right; margin: 5px 0 0 0; font-size: 1rem;">
+        — {quote.split(' - ')[1]}
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Welcome section
+    st.markdown("""
+    <div class="glass-card">
+        <h3 style="color: white; margin-bottom: 10px;">🌟 Welcome!</h3>
+        <p style="color: rgba(255, 255, 255, 0.9); font-size: 1.05rem;">
+        Empowering researchers with intuitive statistical analysis tools. 
+        Transform your data into meaningful insights with our comprehensive platform.
+        </p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Navigation buttons
+    st.markdown('<h3 style="color: white; margin: 30px 0 15px 0;">🚀 Start Analyzing</h3>', unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("""
+        <div class="glass-card" style="text-align: center;">
+            <h4 style="color: white;">📘 Introduction</h4>
+            <p style="color: rgba(255, 255, 255, 0.8);">Learn about our platform</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("""
+        <div class="glass-card" style="text-align: center; background: rgba(255, 255, 255, 0.25);">
+            <h4 style="color: white;">📊 Data Analysis</h4>
+            <p style="color: rgba(255, 255, 255, 0.9);">Start your analysis</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col3:
+        st.markdown("""
+        <div class="glass-card" style="text-align: center;">
+            <h4 style="color: white;">🎯 Quick Demo</h4>
+            <p style="color: rgba(255, 255, 255, 0.8);">Try with sample data</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+    # Core Features
+    st.markdown('<h3 style="color: white; margin: 30px 0 15px 0;">✨ Core Features</h3>', unsafe_allow_html=True)
+
+    cols = st.columns(3)
+    for idx, card in enumerate(FEATURE_CARDS):
+        with cols[idx % 3]:
+            st.markdown(card, unsafe_allow_html=True)
+
+    # Footer
+    st.markdown("---")
+    st.markdown("""
+    <div style="text-align: center; color: rgba(255, 255, 255, 0.6); padding: 20px 0;">
+        <p style="font-size: 1rem;">© 2024 Data Analytics Platform | Group 3 Project</p>
+        <p style="font-size: 0.9rem;">Advanced Statistical Analysis with Spearman Correlation</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+
+def render_introduction():
+    # Animated gradient background
+    st.markdown("""
+    <style>
+        @keyframes gradientAnimation {
+            0% { background-position: 0% 50%; }
+            50% { background-position: 100% 50%; }
+            100% { background-position: 0% 50%; }
+        }
+
+        [data-testid="stAppViewContainer"] {
+            background: linear-gradient(135deg, #e3f2fd 0%, #e0f7fa 25%, #e8eaf6 50%, #f3e5f5 75%, #e3f2fd 100%);
+            background-size: 400% 400%;
+            animation: gradientAnimation 20s ease infinite;
+        }
+
+        .main-container {
+            background: rgba(255, 255, 255, 0.92);
+            backdrop-filter: blur(10px);
+            border-radius: 20px;
+            padding: 2.5rem;
+            margin: 1rem auto;
+            box-shadow: 0 10px 30px rgba(0, 0, 0, 0.1);
+            border: 1px solid rgba(255, 255, 255, 0.2);
+        }
+
+        @keyframes floatAnimation {
+            0%, 100% { transform: translateY(0px); }
+            50% { transform: translateY(-10px); }
+        }
+
+        .team-member-card {
+            background: linear-gradient(135deg, #ffffff 0%, #f8f9fa 100%);
+            border-radius: 15px;
+            padding: 2rem;
+            margin: 1.5rem 0;
+            box-shadow: 0 6px 15px rgba(0, 0, 0, 0.1);
+            transition: all 0.3s ease;
+            border-top: 5px solid;
+        }
+
+        .team-member-card:hover {
+            transform: translateY(-5px);
+            box-shadow: 0 12px 25px rgba(0, 0, 0, 0.15);
+        }
+
+        .team-member-icon {
+            width: 80px;
+            height: 80px;
+            border-radius: 50%;
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            font-size: 2.2rem;
+            color: white;
+            box-shadow: 0 6px 15px rgba(0, 0, 0, 0.2);
+            animation: floatAnimation 3s ease-in-out infinite;
+        }
+
+        .tech-card {
+            background: rgba(255, 255, 255, 0.95);
+            border-radius: 12px;
+            padding: 1.5rem;
+            border: 2px solid rgba(33, 150, 243, 0.1);
+            transition: all 0.3s ease;
+            height: 100%;
+        }
+
+        .tech-card:hover {
+            border-color: #2196f3;
+            box-shadow: 0 8px 20px rgba(33, 150, 243, 0.15);
+            transform: translateY(-3px);
+        }
+    </style>
+    """, unsafe_allow_html=True)
+
+    st.markdown('<div class="main-container">', unsafe_allow_html=True)
+
+    # Header
+    st.markdown("""
+    <div style="text-align: center; padding: 1rem 0 2rem 0;">
+        <h1 style="margin-bottom: 0.5rem; color: #1976d2;">📊 Advanced Statistical Analysis Platform</h1>
+        <p style="font-size: 1.3rem; color: #666; margin-bottom: 1rem;">
+            Comprehensive Data Analysis Solution • Group 3 Project • Professional Analytics Tool
+        </p>
+        <div style="padding: 1rem; background: rgba(33, 150, 243, 0.1); border-radius: 10px; display: inline-block; margin: 1rem auto;">
+            <p style="font-style: italic; color: #2196f3; margin: 0; font-size: 1.1rem;">
+                "It is a capital mistake to theorize before one has data." — Sherlock Holmes
+            </p>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown(DIVIDER, unsafe_allow_html=True)
+
+    # Project Objectives
+    st.markdown("## 🎯 Project Objectives")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.markdown("""
+        <div style="background: rgba(33, 150, 243, 0.05); padding: 1.5rem; border-radius: 15px; height: 100%;">
+            <h3 style="color: #1976d2;">🌍 Global Accessibility</h3>
+            <ul style="color: #333; line-height: 1.8;">
+                <li><strong>Develop an intuitive web-based platform</strong> for statistical analysis accessible to users of all skill levels</li>
+                <li><strong>Support 12 international languages</strong> to ensure global accessibility and usability</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    with col2:
+        st.markdown("""
+        <div style="background: rgba(0, 188, 212, 0.05); padding: 1.5rem; border-radius: 15px; height: 100%;">
+            <h3 style="color: #00838f;">📈 Comprehensive Analysis</h3>
+            <ul style="color: #333; line-height: 1.8;">
+                <li><strong>Implement comprehensive descriptive statistics tools</strong> for data exploration and summary</li>
+                <li><strong>Provide advanced correlation analysis</strong> using Spearman method for ordinal data</li>
+            </ul>
+        </div>
+        """, unsafe_allow_html=True)
+
+    st.markdown(DIVIDER, unsafe_allow_html=True)
+
+    # Technology Stack
+    st.markdown("## 🛠️ Technology Stack")
+    st.write("Our platform is built on a modern technology stack that ensures reliability, performance, and scalability. Each technology is carefully selected for its specific strengths in data analysis and web application development.")
+
+    cols = st.columns(3)
+    for idx, card in enumerate(TECH_CARDS):
+        with cols[idx % 3]:
+            st.markdown(card, unsafe_allow_html=True)
+
+    st.markdown(DIVIDER, unsafe_allow_html=True)
+
+    # Team Members
+    st.markdown("## 👥 Our Team")
+    st.write("Meet the talented team behind this project. Each member brings unique expertise to create a comprehensive statistical analysis platform.")
+
+    cols = st.columns(2)
+    for idx, card in enumerate(TEAM_CARDS):
+        with cols[idx % 2]:
+            st.markdown(card, unsafe_allow_html=True)
+
+    st.markdown(DIVIDER, unsafe_allow_html=True)
+
+    # About the Analysis
+    st.markdown(ABOUT_ANALYSIS)
+
+    st.markdown('</div>', unsafe_allow_html=True)
+
+    # Footer
+    st.markdown("""
+    <div style="text-align: center; margin-top: 3rem; padding: 1.5rem; color: #666; font-size: 0.9rem; border-top: 1px solid rgba(0, 0, 0, 0.1);">
+        <p style="margin: 0;">Advanced Statistical Analysis Platform • Group 3 Project • Built with ❤️ using Streamlit</p>
+        <p style="margin: 0.5rem 0 0 0; opacity: 0.7;">© 2024 All rights reserved</p>
+    </div>
+    """, unsafe_allow_html=True)
+
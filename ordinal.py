@@ -0,0 +1,158 @@
+"""Ordinal association between X and Y Likert items, from their crosstabs.
+
+Two Likert items compress to a small k x k table of answer counts, and
+every statistic here is a function of that table alone: concordant and
+discordant pair counts come from two cumulative sums over it, the tie
+corrections from its margins, and chi-square from its expected counts. So
+after the crosstabs are built the cost does not depend on the number of
+respondents. Every X-by-Y crosstab comes out of one product of answer
+indicator matrices, and the statistics are computed for the whole
+``(pairs, k, k)`` stack of tables at once.
+
+Items that are not small integers with at most ``MAX_CATEGORIES`` answer
+values are skipped.
+"""
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from correlation import fdr_bh
+from counting import small_int_codes
+from instrument import traced
+
+MAX_CATEGORIES = 15
+# Respondents per block of the crosstab product
+CROSSTAB_BLOCK = 4096
+
+ORDINAL_COLUMNS = [
+    "X item", "Y item", "n", "Kendall tau-b", "tau-b p-value", "FDR p-value", "Gamma",
+    "Somers' d", "Chi-square", "df", "Chi-square p-value", "Cramér's V",
+]
+
+
+def item_codes(values):
+    """``(codes, k)`` with -1 for missing answers, or ``None`` if not ordinal categories."""
+    coded = small_int_codes(values)
+    if coded is None or coded[3] > MAX_CATEGORIES:
+        return None
+    codes, valid, _, span = coded
+    if valid is None:
+        return codes, span
+    full = np.full(len(valid), -1, dtype=np.intp)
+    full[valid] = codes
+    return full, span
+
+
+def indicators(items, rows, k):
+    """0/1 answer matrix of ``items`` over ``rows``: column ``i * k + c`` marks answer code ``c`` of item ``i``."""
+    codes = np.column_stack([codes[rows] for codes, _ in items])
+    out = np.zeros((codes.shape[0], len(items) * k), dtype=np.float32)
+    r, i = np.nonzero(codes >= 0)
+    out[r, i * k + codes[r, i]] = 1
+    return out
+
+
+def crosstabs(xs, ys, k):
+    """Crosstabs of every ``(codes, span)`` item in ``xs`` against every one in ``ys``.
+
+    Returns a ``(len(xs) * len(ys), k, k)`` stack, X-major, with every table
+    padded to ``k`` answer codes. All tables come out of one product of the
+    two answer indicator matrices, accumulated ``CROSSTAB_BLOCK`` respondents
+    at a time so memory stays bounded by the block, not the sample.
+    """
+    n = len(xs[0][0]) if xs and ys else 0
+    tables = np.zeros((len(xs) * k, len(ys) * k))
+    for start in range(0, n, CROSSTAB_BLOCK):
+        rows = slice(start, start + CROSSTAB_BLOCK)
+        # float32 counts are exact within a block; the running total is float64
+        tables += indicators(xs, rows, k).T @ indicators(ys, rows, k)
+    return tables.reshape(len(xs), k, len(ys), k).transpose(0, 2, 1, 3).reshape(-1, k, k)
+
+
+def concordance(tables):
+    """Concordant and discordant pair counts of each crosstab in a stack.
+
+    A cell's concordant partners lie strictly below and to the right of it,
+    its discordant partners strictly below and to the left; both are read
+    off cumulative sums of the table.
+    """
+    t = np.asarray(tables, dtype=np.float64)
+    below_right = t[..., ::-1, ::-1].cumsum(-2).cumsum(-1)[..., ::-1, ::-1]
+    below_left = t[..., ::-1, :].cumsum(-2)[..., ::-1, :].cumsum(-1)
+    concordant = np.zeros_like(t)
+    discordant = np.zeros_like(t)
+    concordant[..., :-1, :-1] = below_right[..., 1:, 1:]
+    discordant[..., :-1, 1:] = below_left[..., 1:, :-1]
+    return (t * concordant).sum(axis=(-2, -1)), (t * discordant).sum(axis=(-2, -1))
+
+
+def tie_terms(margins):
+    """Tie sums over each margin, as ``scipy.stats.kendalltau`` computes them."""
+    m = np.asarray(margins, dtype=np.float64)
+    return ((m * (m - 1) / 2).sum(axis=-1), (m * (m - 1) * (m - 2)).sum(axis=-1),
+            (m * (m - 1) * (2 * m + 5)).sum(axis=-1))
+
+
+def table_statistics(tables):
+    """Kendall tau-b, gamma, Somers' d (Y given X), chi-square and Cramér's V of a ``(P, k, k)`` crosstab stack.
+
+    Returns one array of ``P`` values per statistic. The tau-b p-value uses
+    the tie-corrected normal approximation of ``scipy.stats.kendalltau``.
+    """
+    tables = np.asarray(tables, dtype=np.float64)
+    n = tables.sum(axis=(-2, -1))
+    out = {"n": n.astype(np.int64)}
+    rows, cols = tables.sum(axis=-1), tables.sum(axis=-2)
+    p_pairs, q_pairs = concordance(tables)
+    s = p_pairs - q_pairs
+    pairs = n * (n - 1) / 2
+    xtie, x0, x1 = tie_terms(rows)
+    ytie, y0, y1 = tie_terms(cols)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["Kendall tau-b"] = s / np.sqrt((pairs - xtie) * (pairs - ytie))
+        m = n * (n - 1)
+        var = (m * (2 * n + 5) - x1 - y1) / 18 + 2 * xtie * ytie / m + x0 * y0 / (9 * m * (n - 2))
+        out["tau-b p-value"] = np.where(var > 0, 2 * stats.norm.sf(np.abs(s) / np.sqrt(var)), np.nan)
+        out["Gamma"] = s / (p_pairs + q_pairs)
+        out["Somers' d"] = s / (pairs - xtie)
+
+        # Chi-square over the answer categories actually used: cells of an
+        # empty row or column have no expected count and drop out
+        used_rows, used_cols = (rows > 0).sum(axis=-1), (cols > 0).sum(axis=-1)
+        expected = rows[..., :, None] * cols[..., None, :] / n[..., None, None]
+        chi2 = np.where(expected > 0, (tables - expected) ** 2 / expected, 0).sum(axis=(-2, -1))
+        chi2 = np.where(n > 0, chi2, np.nan)
+        dof = (used_rows - 1) * (used_cols - 1)
+        out["Chi-square"] = chi2
+        out["df"] = dof
+        out["Chi-square p-value"] = np.where(dof > 0, stats.chi2.sf(chi2, np.maximum(dof, 1)), np.nan)
+        k = np.minimum(used_rows, used_cols) - 1
+        out["Cramér's V"] = np.where(k > 0, np.sqrt(chi2 / (n * k)), np.nan)
+    return out
+
+
+@traced("ordinal")
+def ordinal_associations(data, x_items, y_items):
+    """One row per (X item, Y item) Likert pair with its ordinal statistics.
+
+    The tau-b p-values are FDR-adjusted over all pairs, as for the item
+    correlation matrix.
+    """
+    x_items, y_items = list(x_items), list(y_items)
+    numeric = data[list(dict.fromkeys(x_items + y_items))].apply(pd.to_numeric, errors="coerce")
+    codes = {}
+    for item in numeric.columns:
+        coded = item_codes(numeric[item].to_numpy(dtype=np.float64, na_value=np.nan))
+        # Text columns and items nobody answered have no categories to cross
+        if coded is not None and coded[1] > 0:
+            codes[item] = coded
+    xs = [i for i in x_items if i in codes]
+    ys = [i for i in y_items if i in codes]
+
+    k = max((codes[i][1] for i in xs + ys), default=1)
+    statistics = table_statistics(crosstabs([codes[x] for x in xs], [codes[y] for y in ys], k))
+    out = pd.DataFrame({"X item": np.repeat(xs, len(ys)), "Y item": np.tile(ys, len(xs)), **statistics},
+                       columns=[c for c in ORDINAL_COLUMNS if c != "FDR p-value"])
+    out.insert(ORDINAL_COLUMNS.index("FDR p-value"), "FDR p-value", fdr_bh(out["tau-b p-value"].to_numpy()))
+    return out
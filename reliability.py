@@ -0,0 +1,153 @@
+"""Internal consistency of the X and Y scales.
+
+Cronbach's alpha, McDonald's omega, corrected item-total correlations and
+alpha-if-item-deleted all follow from one item covariance matrix ``C``:
+with ``c_i`` the row sums of ``C`` and ``V`` its grand sum (the variance of
+the total score), dropping item ``i`` leaves a total with variance
+``V - 2 c_i + C_ii``, and the item's covariance with the rest of the scale
+is ``c_i - C_ii``. No per-item re-summing of the data is needed, so the
+cost beyond the covariance itself is a few vector operations plus the
+eigen-decompositions of the one-factor fit.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from scipy import linalg
+
+from instrument import traced
+
+OMEGA_MAX_ITER = 200
+OMEGA_TOL = 1e-6
+
+
+@dataclass
+class ScaleReliability:
+    name: str
+    items: list
+    n: int
+    alpha: float
+    omega: float
+    table: pd.DataFrame
+
+    def summary(self):
+        return {"items": len(self.items), "n": self.n, "alpha": self.alpha, "omega": self.omega}
+
+
+def complete_covariance(frame):
+    """Item covariance over the respondents who answered every item, and their count."""
+    X = frame.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    X = X[~np.isnan(X).any(axis=1)]
+    n = X.shape[0]
+    if n < 2:
+        return np.full((X.shape[1], X.shape[1]), np.nan), n
+    X = X - X.mean(axis=0)
+    return X.T @ X / (n - 1), n
+
+
+def cronbach_alpha(cov):
+    k = cov.shape[0]
+    total = cov.sum()
+    if k < 2 or total <= 0:
+        return np.nan
+    return k / (k - 1) * (1 - np.trace(cov) / total)
+
+
+def one_factor_loadings(cov):
+    """Loadings of a one-factor model by iterated principal-axis factoring.
+
+    Communalities start at the squared multiple correlations and are refined
+    until they settle; loadings are on the covariance scale and oriented so
+    that they sum to a positive value.
+    """
+    k = cov.shape[0]
+    var = np.diag(cov).copy()
+    sd = np.sqrt(var)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Constant items correlate with nothing
+        R = np.nan_to_num(cov / np.outer(sd, sd))
+    np.fill_diagonal(R, 1.0)
+    try:
+        h = 1 - 1 / np.diag(linalg.pinvh(R))
+    except (linalg.LinAlgError, ValueError):
+        h = np.full(k, 0.5)
+    h = np.clip(np.nan_to_num(h, nan=0.5), 0.005, 1.0)
+
+    loadings = np.zeros(k)
+    for _ in range(OMEGA_MAX_ITER):
+        reduced = R.copy()
+        np.fill_diagonal(reduced, h)
+        value, vector = linalg.eigh(reduced, subset_by_index=[k - 1, k - 1])
+        loadings = vector[:, 0] * np.sqrt(max(value[0], 0.0))
+        new_h = np.minimum(loadings ** 2, 1.0)
+        converged = np.max(np.abs(new_h - h)) < OMEGA_TOL
+        h = new_h
+        if converged:
+            break
+    if loadings.sum() < 0:
+        loadings = -loadings
+    return loadings * sd
+
+
+def mcdonald_omega(cov, loadings=None):
+    """Omega total of a one-factor model: common over total score variance."""
+    if cov.shape[0] < 2 or not np.isfinite(cov).all():
+        return np.nan
+    loadings = one_factor_loadings(cov) if loadings is None else loadings
+    common = loadings.sum() ** 2
+    unique = np.clip(np.diag(cov) - loadings ** 2, 0.0, None).sum()
+    return common / (common + unique) if common + unique > 0 else np.nan
+
+
+def item_statistics(cov, items):
+    """Corrected item-total correlation and alpha-if-deleted for every item at once."""
+    k = cov.shape[0]
+    diag = np.diag(cov)
+    row = cov.sum(axis=1)
+    total = row.sum()
+    rest_var = total - 2 * row + diag
+    with np.errstate(divide="ignore", invalid="ignore"):
+        item_rest = (row - diag) / np.sqrt(diag * rest_var)
+        alpha_deleted = (k - 1) / (k - 2) * (1 - (np.trace(cov) - diag) / rest_var) if k > 2 else np.full(k, np.nan)
+    return pd.DataFrame({
+        "Item": list(items),
+        "Corrected item-total r": item_rest,
+        "Alpha if deleted": alpha_deleted,
+    })
+
+
+@traced("reliability")
+def scale_reliability(frame, items, name=None):
+    """``ScaleReliability`` for ``items`` of ``frame``, listwise-complete respondents."""
+    items = list(items)
+    cov, n = complete_covariance(frame[items])
+    return reliability_from_cov(cov, n, items, name)
+
+
+def reliability_from_cov(cov, n, items, name=None):
+    """``ScaleReliability`` from an already accumulated item covariance matrix."""
+    items = list(items)
+    finite = np.isfinite(cov).all() and len(items) >= 2
+    loadings = one_factor_loadings(cov) if finite else np.full(len(items), np.nan)
+    table = item_statistics(cov, items)
+    table["Factor loading"] = loadings
+    return ScaleReliability(
+        name=name,
+        items=items,
+        n=int(n),
+        alpha=float(cronbach_alpha(cov)) if finite else np.nan,
+        omega=float(mcdonald_omega(cov, loadings)) if finite else np.nan,
+        table=table,
+    )
+
+
+def alpha_label(alpha):
+    """Conventional reading of Cronbach's alpha."""
+    if not np.isfinite(alpha):
+        return "Not available"
+    if alpha >= 0.9: return "Excellent"
+    if alpha >= 0.8: return "Good"
+    if alpha >= 0.7: return "Acceptable"
+    if alpha >= 0.6: return "Questionable"
+    if alpha >= 0.5: return "Poor"
+    return "Unacceptable"
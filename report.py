@@ -0,0 +1,715 @@
+"""PDF report generation, run on demand as a cached background job.
+
+``build_report`` lays the report out section by section from an
+``AnalysisResult`` and its chart PNGs, the same figures (and figure cache
+entries) the screen shows. The ANALYSIS tab asks for it through ``request_report``, which builds it in a
+worker thread, straight into a temporary file, and keeps the finished file
+keyed by the analysis fingerprint so repeated downloads are instant.
+"""
+import contextvars
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+
+from engine import corr_strength
+from ingest import private_dir
+from instrument import traced
+
+# Finished reports kept per process; older ones are deleted from disk
+MAX_REPORTS = 16
+# Item pairs listed in the ordinal association table
+ORDINAL_REPORT_PAIRS = 15
+
+
+def report_styles():
+    """Title, heading, subheading, body and highlight paragraph styles."""
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_JUSTIFY
+
+    styles = getSampleStyleSheet()
+    
+    # Custom styles
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#0d47a1'),
+        spaceAfter=30,
+        alignment=TA_CENTER,
+        fontName='Helvetica-Bold'
+    )
+    
+    heading_style = ParagraphStyle(
+        'CustomHeading',
+        parent=styles['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#1565c0'),
+        spaceAfter=12,
+        spaceBefore=12,
+        fontName='Helvetica-Bold'
+    )
+    
+    subheading_style = ParagraphStyle(
+        'CustomSubHeading',
+        parent=styles['Heading3'],
+        fontSize=14,
+        textColor=colors.HexColor('#1976d2'),
+        spaceAfter=10,
+        spaceBefore=10,
+        fontName='Helvetica-Bold'
+    )
+    
+    body_style = ParagraphStyle(
+        'CustomBody',
+        parent=styles['Normal'],
+        fontSize=11,
+        alignment=TA_JUSTIFY,
+        spaceAfter=12
+    )
+    
+    highlight_style = ParagraphStyle(
+        'Highlight',
+        parent=styles['Normal'],
+        fontSize=10,
+        leftIndent=20,
+        rightIndent=20,
+        spaceAfter=12,
+        spaceBefore=12,
+        backColor=colors.HexColor('#f4f8ff'),
+        borderColor=colors.HexColor('#1e88e5'),
+        borderWidth=1,
+        borderPadding=8
+    )
+    return title_style, heading_style, subheading_style, body_style, highlight_style
+
+
+def grid_table(data, col_widths):
+    """Table with the report's header row and grid styling."""
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+
+    table = Table(data, colWidths=col_widths)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e3f2fd')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+    ]))
+    return table
+
+
+@traced("pdf")
+def build_batch_report(result, charts, target, progress=None):
+    """Combined PDF for a ``batch.BatchResult``: scales, reliability and all pairs.
+
+    ``charts`` is unused; it keeps the signature of ``build_report`` so both
+    can run through ``request_report``.
+    """
+    from charts import heatmap_png
+    from batch import pair_matrix
+    from correlation import CorrelationMatrix
+    from reliability import alpha_label
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, PageBreak, Image
+    from reportlab.lib.utils import ImageReader
+
+    def report(fraction, stage):
+        if progress is not None:
+            progress(fraction, stage)
+
+    doc = SimpleDocTemplate(target, pagesize=letter,
+                           rightMargin=72, leftMargin=72,
+                           topMargin=72, bottomMargin=18)
+    story = []
+    title_style, heading_style, subheading_style, body_style, highlight_style = report_styles()
+    pairs = result.pairs
+    n_sig = int((pairs["FDR p-value"] < 0.05).sum())
+
+    report(0.05, "Summary")
+    story.append(Paragraph("📊 MULTI-SCALE ASSOCIATION REPORT", title_style))
+    story.append(Spacer(1, 0.3*inch))
+    story.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", body_style))
+    story.append(Paragraph(f"<b>Total Respondents:</b> {result.n}", body_style))
+    story.append(Paragraph(f"<b>Scales:</b> {len(result.scales)} ({len(pairs)} scale pairs)", body_style))
+    story.append(Spacer(1, 0.2*inch))
+    story.append(Paragraph("Executive Summary", heading_style))
+    story.append(Paragraph(f"""
+    Every pair of scales was correlated, using Pearson correlation when both scale scores are
+    approximately normal and Spearman rank correlation otherwise. <b>{n_sig} of {len(pairs)}</b>
+    pairs are statistically significant after Benjamini–Hochberg FDR correction across all pairs (α = 0.05).
+    """, body_style))
+
+    report(0.15, "Scales")
+    story.append(Paragraph("SCALES", heading_style))
+    scale_data = [['Scale', 'Items', 'Mean', 'Std Dev', "Cronbach's α", "McDonald's ω", 'Normality p']]
+    for name, items in result.scales.items():
+        d = result.descriptives[name]
+        rel = result.reliability.get(name)
+        scale_data.append([
+            name, str(len(items)), f"{d['Mean']:.2f}", f"{d['Std Deviation']:.2f}",
+            f"{rel.alpha:.3f} ({alpha_label(rel.alpha)})" if rel else '-',
+            f"{rel.omega:.3f}" if rel else '-',
+            f"{result.normality_tests[name]['p']:.4f}",
+        ])
+    story.append(grid_table(scale_data, [1.1*inch, 0.5*inch, 0.6*inch, 0.7*inch, 1.4*inch, 0.9*inch, 0.9*inch]))
+    story.append(Spacer(1, 0.15*inch))
+    for name, items in result.scales.items():
+        story.append(Paragraph(f"<b>{name}:</b> {', '.join(map(str, items))}", body_style))
+
+    report(0.3, "Correlation matrix")
+    story.append(PageBreak())
+    story.append(Paragraph("SCALE CORRELATION MATRIX", heading_style))
+    matrix = CorrelationMatrix("Pearson/Spearman", pair_matrix(result), pair_matrix(result, "p-value"),
+                               pair_matrix(result, "FDR p-value"), pair_matrix(result, "n"))
+    heatmap = heatmap_png(matrix, title="Scale correlations (method chosen per pair)")
+    img_w, img_h = ImageReader(BytesIO(heatmap)).getSize()
+    width = min(6*inch, img_w * 0.5)
+    story.append(Image(BytesIO(heatmap), width=width, height=width * img_h / img_w))
+    story.append(Paragraph("Starred cells remain significant after FDR correction.", highlight_style))
+
+    report(0.4, "Pair table")
+    story.append(PageBreak())
+    story.append(Paragraph("ALL SCALE PAIRS", heading_style))
+    pair_data = [['Scale A', 'Scale B', 'Method', 'r', 'p-value', 'FDR p', 'Strength']]
+    for _, row in pairs.sort_values("FDR p-value").iterrows():
+        pair_data.append([
+            str(row['Scale A']), str(row['Scale B']), row['Method'].split()[0],
+            f"{row['r']:.3f}", f"{row['p-value']:.4f}", f"{row['FDR p-value']:.4f}",
+            f"{row['Strength']} {row['Direction']}",
+        ])
+    story.append(grid_table(pair_data, [1*inch, 1*inch, 0.8*inch, 0.6*inch, 0.8*inch, 0.8*inch, 1.4*inch]))
+
+    laid_out, total = [0], len(story)
+
+    def after_flowable(flowable):
+        laid_out[0] += 1
+        if laid_out[0] % 10 == 0:
+            report(0.5 + 0.5 * min(laid_out[0] / total, 1.0), "Laying out pages")
+
+    doc.afterFlowable = after_flowable
+    doc.build(story)
+    report(1.0, "Report ready")
+
+
+@traced("pdf")
+def build_report(result, charts, target, progress=None):
+    """Write the full PDF for ``result`` to ``target`` (a path or binary buffer).
+
+    ``charts`` maps variable names to the PNG bytes from
+    ``charts.render_distributions``; None renders them here, so a background
+    job does not keep the page waiting on them. ``progress(fraction, stage)``
+    is called as sections are assembled and while pages are laid out.
+    """
+    from charts import heatmap_png, render_distributions, scatter_png
+    from reliability import alpha_label
+
+    def report(fraction, stage):
+        if progress is not None:
+            progress(fraction, stage)
+
+    if charts is None:
+        report(0.0, "Rendering charts")
+        # Figures already viewed on the page come from the figure cache
+        charts = render_distributions(result)
+
+    x_items, y_items = result.x_items, result.y_items
+    x_norm = result.normality["X_total"]
+    y_norm = result.normality["Y_total"]
+    assoc = result.association
+    r, p = assoc["r"], assoc["p"]
+    method, reason = assoc["method"], assoc["reason"]
+    strength, direction = assoc["strength"], assoc["direction"]
+
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, Image
+    from reportlab.lib import colors
+    from reportlab.lib.utils import ImageReader
+    
+    doc = SimpleDocTemplate(target, pagesize=letter,
+                           rightMargin=72, leftMargin=72,
+                           topMargin=72, bottomMargin=18)
+    
+    story = []
+    title_style, heading_style, subheading_style, body_style, highlight_style = report_styles()
+    
+    # Title
+    story.append(Paragraph("📊 STATISTICAL ANALYSIS REPORT", title_style))
+    story.append(Spacer(1, 0.5*inch))
+    
+    # Report Information
+    story.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", body_style))
+    story.append(Paragraph(f"<b>Total Respondents:</b> {result.n}", body_style))
+    story.append(Paragraph(f"<b>X Variables:</b> {', '.join(x_items)}", body_style))
+    story.append(Paragraph(f"<b>Y Variables:</b> {', '.join(y_items)}", body_style))
+    story.append(Spacer(1, 0.3*inch))
+    
+    report(0.02, "Summary")
+
+    # Executive Summary
+    story.append(Paragraph("Executive Summary", heading_style))
+    summary = f"""
+    This report presents a comprehensive statistical analysis of survey data. 
+    The analysis reveals a <b>{strength.lower()}</b> {direction.lower()} relationship 
+    between X and Y variables (r = {r:.3f}, p = {p:.4f}). The relationship is 
+    {"<b>statistically significant</b>" if p < 0.05 else "<b>not statistically significant</b>"} 
+    at α = 0.05.
+    """
+    story.append(Paragraph(summary, body_style))
+    story.append(PageBreak())
+    
+    # Descriptive Analysis
+    report(0.05, "Descriptive analysis")
+    story.append(Paragraph("DESCRIPTIVE ANALYSIS", heading_style))
+    story.append(Spacer(1, 0.2*inch))
+    
+    for idx, col in enumerate(result.variables):
+        report(0.05 + 0.25 * idx / len(result.variables), f"Descriptive analysis: {col}")
+        story.append(Paragraph(f"Variable: {col}", subheading_style))
+        
+        if col in result.descriptives:
+            desc = result.descriptives[col]
+            
+            desc_data = [['Statistic', 'Value']]
+            for stat_name, stat_value in desc.items():
+                if isinstance(stat_value, (int, float)):
+                    desc_data.append([stat_name, f"{stat_value:.2f}"])
+                else:
+                    desc_data.append([stat_name, str(stat_value)])
+            
+            desc_table = Table(desc_data, colWidths=[2.5*inch, 2*inch])
+            desc_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e3f2fd')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 11),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ]))
+            story.append(desc_table)
+            story.append(Spacer(1, 0.2*inch))
+            
+            # Add charts to PDF (same PNG as shown on screen)
+            img = Image(BytesIO(charts[col]), width=6*inch, height=2.1*inch)
+            story.append(img)
+            story.append(Spacer(1, 0.15*inch))
+            
+            takeaway = f"""
+            <b>Key Takeaways:</b><br/>
+            • The histogram reveals the distribution shape and potential skewness.<br/>
+            • The boxplot highlights the median (middle line) and identifies outliers (dots beyond whiskers).<br/>
+            • Mean = {desc['Mean']:.2f}, Median = {desc['Median']:.2f}, Std Dev = {desc['Std Deviation']:.2f}.<br/>
+            • Outliers may indicate extreme responses that affect the mean.
+            """
+            story.append(Paragraph(takeaway, highlight_style))
+            story.append(Spacer(1, 0.15*inch))
+            
+            if result.likert[col]:
+                likert_note = """
+                <b>Likert Scale Insight:</b><br/>
+                This variable follows a Likert-type scale (1-5), allowing ordinal interpretation 
+                and supporting non-parametric analysis if normality is violated.
+                """
+                story.append(Paragraph(likert_note, highlight_style))
+                story.append(Spacer(1, 0.15*inch))
+        
+        # Frequency table
+        freq = result.frequencies[col]
+        story.append(Paragraph(f"Frequency Distribution for {col}:", subheading_style))
+        
+        freq_data = [['Category', 'Frequency', 'Percentage (%)']]
+        for _, row in freq.head(10).iterrows():
+            freq_data.append([str(row['Category']), str(row['Frequency']), f"{row['Percentage (%)']}%"])
+        
+        freq_table_obj = Table(freq_data, colWidths=[1.5*inch, 1.5*inch, 1.5*inch])
+        freq_table_obj.setStyle(TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e3f2fd')),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ]))
+        story.append(freq_table_obj)
+        story.append(Spacer(1, 0.15*inch))
+        
+        freq_interp = """
+        <b>Frequency Interpretation:</b><br/>
+        • Dominant categories represent prevailing respondent opinions.<br/>
+        • Percentage distribution reflects response variability and concentration.
+        """
+        story.append(Paragraph(freq_interp, highlight_style))
+        story.append(Spacer(1, 0.3*inch))
+    
+    # Scale Reliability
+    if result.reliability:
+        report(0.3, "Scale reliability")
+        story.append(PageBreak())
+        story.append(Paragraph("SCALE RELIABILITY", heading_style))
+        story.append(Spacer(1, 0.2*inch))
+        story.append(Paragraph(
+            "Internal consistency of each multi-item scale, from the item covariance matrix of respondents "
+            "who answered every item: Cronbach's alpha, McDonald's omega (one-factor model), corrected "
+            "item-total correlations and alpha if the item is deleted.", body_style))
+        story.append(Spacer(1, 0.15*inch))
+        for name, rel in result.reliability.items():
+            story.append(Paragraph(
+                f"{name}: α = {rel.alpha:.3f} ({alpha_label(rel.alpha)}), ω = {rel.omega:.3f}, "
+                f"n = {rel.n:,} complete responses", subheading_style))
+            rel_data = [['Item', 'Corrected Item-Total r', 'Alpha if Deleted', 'Factor Loading']]
+            for _, row in rel.table.iterrows():
+                rel_data.append([str(row['Item']), f"{row['Corrected item-total r']:.3f}",
+                                 f"{row['Alpha if deleted']:.3f}", f"{row['Factor loading']:.3f}"])
+            rel_table = Table(rel_data, colWidths=[1.5*inch, 1.6*inch, 1.4*inch, 1.3*inch])
+            rel_table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e3f2fd')),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 10),
+                ('FONTSIZE', (0, 1), (-1, -1), 9),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+                ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+            ]))
+            story.append(rel_table)
+            story.append(Spacer(1, 0.2*inch))
+    
+    # Normality Testing
+    report(0.32, "Normality testing")
+    story.append(PageBreak())
+    story.append(Paragraph("NORMALITY TESTING", heading_style))
+    story.append(Spacer(1, 0.2*inch))
+    
+    tests_used = sorted({t["test"] for t in result.normality_tests.values()})
+    norm_text = f"""
+    The {" and ".join(tests_used) or "Shapiro-Wilk"} test{"s were" if len(tests_used) > 1 else " was"} performed to assess the normality of composite variables. 
+    Shapiro-Wilk is used up to 5,000 observations and D'Agostino-Pearson K² above that, where 
+    Shapiro-Wilk p-values are unreliable. This test is crucial for determining which correlation method to use.
+    """
+    story.append(Paragraph(norm_text, body_style))
+    story.append(Spacer(1, 0.15*inch))
+    
+    def test_label(col):
+        test = result.normality_tests.get(col)
+        if test is None:
+            return '-'
+        return f"{test['test']} (n = {test['n']:,})"
+    
+    norm_data = [
+        ['Variable', 'Test', 'p-value', 'Distribution', 'Interpretation'],
+        ['X_total', test_label('X_total'), f'{x_norm:.4f}', 
+         'Normal' if x_norm > 0.05 else 'Not Normal',
+         'Use parametric tests' if x_norm > 0.05 else 'Use non-parametric tests'],
+        ['Y_total', test_label('Y_total'), f'{y_norm:.4f}', 
+         'Normal' if y_norm > 0.05 else 'Not Normal',
+         'Use parametric tests' if y_norm > 0.05 else 'Use non-parametric tests']
+    ]
+    
+    norm_table = Table(norm_data, colWidths=[0.9*inch, 1.9*inch, 0.8*inch, 1*inch, 1.7*inch])
+    norm_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e3f2fd')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+    ]))
+    story.append(norm_table)
+    story.append(Spacer(1, 0.2*inch))
+    
+    norm_interp = f"""
+    <b>Normality Test Results:</b><br/>
+    • X_total: p = {x_norm:.4f} → {'Data is approximately normal (p > 0.05)' if x_norm > 0.05 else 'Data is NOT normal (p ≤ 0.05)'}<br/>
+    • Y_total: p = {y_norm:.4f} → {'Data is approximately normal (p > 0.05)' if y_norm > 0.05 else 'Data is NOT normal (p ≤ 0.05)'}<br/>
+    • <b>Decision:</b> {'Both variables are normal, use Pearson correlation' if (x_norm > 0.05 and y_norm > 0.05) else 'At least one variable is not normal, use Spearman correlation'}
+    """
+    story.append(Paragraph(norm_interp, highlight_style))
+    
+    # Association Analysis
+    report(0.33, "Association analysis")
+    story.append(PageBreak())
+    story.append(Paragraph("ASSOCIATION ANALYSIS", heading_style))
+    story.append(Spacer(1, 0.2*inch))
+    
+    story.append(Paragraph(f"Method Selected: {method}", subheading_style))
+    method_reason = f"""
+    <b>Why {method}?</b><br/>
+    {reason}<br/>
+    Decided by: {"; ".join(f"{c} {test_label(c)}, p = {result.normality[c]:.4f}" for c in result.normality_tests)}
+    """
+    story.append(Paragraph(method_reason, highlight_style))
+    story.append(Spacer(1, 0.2*inch))
+    
+    # Scatter plot
+    scatter_buffer = BytesIO(scatter_png(result.data, report=True, title=f"{method}\nr = {r:.3f}, p = {p:.4f}",
+                                         pair=result.pair_stats))
+    
+    scatter_img = Image(scatter_buffer, width=5*inch, height=4.2*inch)
+    story.append(scatter_img)
+    story.append(Spacer(1, 0.2*inch))
+    
+    # Correlation Results
+    story.append(Paragraph("Correlation Results:", subheading_style))
+    
+    corr_data = [
+        ['Metric', 'Value', 'Interpretation'],
+        ['Correlation Coefficient (r)', f'{r:.3f}', f'{strength} {direction}'],
+        ['p-value', f'{p:.4f}', 'Significant' if p < 0.05 else 'Not Significant'],
+    ]
+    if "ci_low" in assoc:
+        corr_data.append([
+            f"{assoc['ci_level']:.0%} Bootstrap CI",
+            f"[{assoc['ci_low']:.3f}, {assoc['ci_high']:.3f}]",
+            f"{'BCa' if assoc['ci_method'] == 'bca' else 'Percentile'}, {assoc['resamples']:,} resamples",
+        ])
+    if "p_perm" in assoc:
+        corr_data.append([
+            'Permutation p-value', f"{assoc['p_perm']:.4f}",
+            f"{'Significant' if assoc['p_perm'] < 0.05 else 'Not Significant'} ({assoc['permutations']:,} permutations)",
+        ])
+    corr_data += [
+        ['Strength', strength, corr_strength(r)],
+        ['Direction', direction, 'Variables move together' if r > 0 else 'Variables move oppositely'],
+        ['Significance Level', 'α = 0.05', 'Yes' if p < 0.05 else 'No']
+    ]
+    
+    corr_table = Table(corr_data, colWidths=[2*inch, 1.5*inch, 2*inch])
+    corr_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#e3f2fd')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.HexColor('#0d47a1')),
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+    ]))
+    story.append(corr_table)
+    story.append(Spacer(1, 0.2*inch))
+    
+    # Item-level correlation matrix, same method as the composites
+    matrix = result.item_correlations.get("pearson" if method.startswith("Pearson") else "spearman")
+    if matrix is not None:
+        story.append(Paragraph("Item-Level Correlation Matrix:", subheading_style))
+        heatmap = heatmap_png(matrix)
+        img_w, img_h = ImageReader(BytesIO(heatmap)).getSize()
+        width = min(6*inch, img_w * 0.5)
+        story.append(Image(BytesIO(heatmap), width=width, height=width * img_h / img_w))
+        n_sig = int((matrix.p_fdr < 0.05).sum().sum())
+        story.append(Paragraph(
+            f"{n_sig} of {matrix.r.size} X–Y item pairs are significant after Benjamini–Hochberg "
+            f"FDR correction (α = 0.05); starred cells remain significant.", highlight_style))
+        story.append(Spacer(1, 0.2*inch))
+
+    if result.ordinal is not None and len(result.ordinal):
+        story.append(Paragraph("Ordinal Association of Likert Item Pairs:", subheading_style))
+        top = result.ordinal.sort_values("Kendall tau-b", key=abs, ascending=False).head(ORDINAL_REPORT_PAIRS)
+        ordinal_data = [['X item', 'Y item', 'τ-b', 'FDR p', 'γ', "Somers' d", "Cramér's V"]]
+        for _, row in top.iterrows():
+            ordinal_data.append([str(row['X item']), str(row['Y item'])] + [
+                f"{row[col]:.4f}" if col == 'FDR p-value' else f"{row[col]:.3f}"
+                for col in ['Kendall tau-b', 'FDR p-value', 'Gamma', "Somers' d", "Cramér's V"]
+            ])
+        story.append(grid_table(ordinal_data, [1*inch, 1*inch, 0.7*inch, 0.8*inch, 0.7*inch, 0.9*inch, 0.9*inch]))
+        story.append(Paragraph(
+            f"Strongest {len(top)} of {len(result.ordinal)} X–Y item pairs by |τ-b|, computed from each pair's "
+            f"answer crosstab. Somers' d treats the Y item as dependent.", body_style))
+        story.append(Spacer(1, 0.2*inch))
+    
+    # Interpretation
+    story.append(Paragraph("Statistical Interpretation:", subheading_style))
+    interpretation = f"""
+    <b>Detailed Interpretation:</b><br/>
+    • The correlation coefficient of <b>r = {r:.3f}</b> indicates a <b>{strength.lower()}</b> relationship between X and Y.<br/>
+    • Direction: <b>{direction}</b> - as X_total increases by one point, Y_total tends to {"increase" if r > 0 else "decrease"} by about <b>{abs(result.pair_stats.slope):.2f}</b> points (least-squares slope, the trend line above).<br/>
+    • The p-value of <b>{p:.4f}</b> indicates the relationship is <b>{"statistically significant" if p < 0.05 else "not statistically significant"}</b> at α = 0.05.<br/>
+    • Effect size: {"Small effect" if abs(r) < 0.3 else "Medium effect" if abs(r) < 0.5 else "Large effect"}.<br/>
+    • <b>Important:</b> This analysis shows <b>association, NOT causation</b>. Correlation does not imply that X causes Y or vice versa.
+    """
+    story.append(Paragraph(interpretation, highlight_style))
+    
+    # Conclusions
+    report(0.38, "Conclusions")
+    story.append(PageBreak())
+    story.append(Paragraph("CONCLUSIONS AND RECOMMENDATIONS", heading_style))
+    story.append(Spacer(1, 0.2*inch))
+    
+    conclusion_text = f"""
+    <b>Key Findings:</b><br/>
+    1. <b>Descriptive Analysis:</b> Revealed meaningful response patterns across all variables with appropriate measures of central tendency and dispersion.<br/>
+    2. <b>Composite Scores:</b> X_total and Y_total were created by aggregating multiple items{
+        "; internal consistency was " + ", ".join(
+            f"α = {rel.alpha:.2f} ({alpha_label(rel.alpha).lower()}) for {name}"
+            for name, rel in result.reliability.items())
+        if result.reliability else ""}.<br/>
+    3. <b>Normality Testing:</b> {"Both variables showed normal distribution" if (x_norm > 0.05 and y_norm > 0.05) else "At least one variable violated normality assumption"}, 
+    guiding the selection of {method}.<br/>
+    4. <b>Association Analysis:</b> Found a {strength.lower()} {direction.lower()} relationship (r = {r:.3f}) that is 
+    {"statistically significant (p < 0.05)" if p < 0.05 else "not statistically significant (p ≥ 0.05)"}.<br/>
+    <br/>
+    <b>Practical Implications:</b><br/>
+    • Results are suitable for academic reports, research papers, and program evaluations.<br/>
+    • The {"significant" if p < 0.05 else "non-significant"} relationship {"suggests" if p < 0.05 else "does not support"} 
+    a meaningful association between X and Y variables.<br/>
+    • Consider additional analyses such as regression modeling to explore predictive relationships.<br/>
+    <br/>
+    <b>Limitations:</b><br/>
+    • Correlation does not imply causation - experimental studies needed to establish causal relationships.<br/>
+    • Results are specific to this sample and may not generalize to other populations.<br/>
+    • Potential confounding variables were not controlled in this analysis.<br/>
+    <br/>
+    <b>Recommendations:</b><br/>
+    • Conduct follow-up studies with larger sample sizes to validate findings.<br/>
+    • Investigate potential mediating or moderating variables.<br/>
+    • Consider longitudinal designs to examine relationships over time.<br/>
+    • Use these results as preliminary evidence for hypothesis generation.
+    """
+    story.append(Paragraph(conclusion_text, body_style))
+    
+    # Methodology Notes
+    story.append(Spacer(1, 0.3*inch))
+    story.append(Paragraph("METHODOLOGY NOTES", heading_style))
+    
+    methodology = f"""
+    <b>Statistical Methods Used:</b><br/>
+    • Descriptive Statistics: Mean, Median, Standard Deviation, Variance, Min/Max<br/>
+    • Normality Testing: {", ".join(test_label(c) for c in result.normality_tests) or "Shapiro-Wilk test"} (α = 0.05)<br/>
+    • Association Analysis: {method}<br/>
+    • Significance Level: α = 0.05 (95% confidence level)<br/>
+    • Data Processing: Missing values handled via listwise deletion<br/>
+    <br/>
+    <b>Software & Tools:</b><br/>
+    • Python 3.x with scientific computing libraries<br/>
+    • pandas for data manipulation<br/>
+    • scipy.stats for statistical testing<br/>
+    • matplotlib and seaborn for visualizations<br/>
+    • reportlab for PDF generation<br/>
+    <br/>
+    <b>Sample Characteristics:</b><br/>
+    • Total Respondents: {result.n}<br/>
+    • X Variables Analyzed: {len(x_items)}<br/>
+    • Y Variables Analyzed: {len(y_items)}<br/>
+    • Composite Scores: Created by summing individual items<br/>
+    <br/>
+    <b>Report Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}<br/>
+    <b>Analysis Tool:</b> Statistical Analyzer Pro
+    """
+    story.append(Paragraph(methodology, body_style))
+    
+    # Build PDF; page layout is the slow part, so report it per flowable
+    # doc.build consumes the story list, so count it first
+    laid_out, total = [0], len(story)
+
+    def after_flowable(flowable):
+        laid_out[0] += 1
+        if laid_out[0] % 10 == 0:
+            report(0.4 + 0.6 * min(laid_out[0] / total, 1.0), "Laying out pages")
+
+    doc.afterFlowable = after_flowable
+    doc.build(story)
+    report(1.0, "Report ready")
+
+
+class ReportJob:
+    """A report being built (or already built) in the background."""
+
+    def __init__(self, key, path=None):
+        self.key = key
+        self.path = path
+        self.buffer = None if path else BytesIO()
+        self.progress = 0.0
+        self.stage = "Queued"
+        self.error = None
+        self.future = None
+
+    def update(self, fraction, stage):
+        self.progress, self.stage = fraction, stage
+
+    def done(self):
+        return self.future is not None and self.future.done()
+
+    def read(self):
+        if self.path:
+            with open(self.path, "rb") as fh:
+                return fh.read()
+        return self.buffer.getvalue()
+
+    def discard(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="pdf-report")
+_jobs = OrderedDict()
+_lock = threading.Lock()
+
+
+def report_dir():
+    """Where finished PDFs go: ANALYZER_REPORT_DIR, by default a private per-user folder; empty keeps them in memory."""
+    return private_dir("reports", "ANALYZER_REPORT_DIR")
+
+
+def report_job(key):
+    """The job for ``key`` if one is queued, running or finished without error."""
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and job.done() and job.error is not None:
+            _jobs.pop(key)
+            job.discard()
+            return None
+        return job
+
+
+def request_report(key, result, charts, builder=None):
+    """Start building the report for ``key`` unless it is already available.
+
+    ``builder`` defaults to ``build_report``; batch runs pass
+    ``build_batch_report``.
+    """
+    builder = builder or build_report
+    with _lock:
+        job = _jobs.get(key)
+        if job is not None and job.error is None:
+            _jobs.move_to_end(key)
+            return job
+
+        directory = report_dir()
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        job = ReportJob(key, os.path.join(directory, f"{key}.pdf") if directory else None)
+
+        def run():
+            try:
+                builder(result, charts, job.path or job.buffer, job.update)
+            except Exception as exc:
+                job.error = exc
+                job.discard()
+
+        # Spans recorded by the caller's diagnostics panel follow the build into the worker
+        job.future = _executor.submit(contextvars.copy_context().run, run)
+        _jobs[key] = job
+        while len(_jobs) > MAX_REPORTS:
+            _, old = _jobs.popitem(last=False)
+            if old.done():
+                old.discard()
+        return job
@@ -0,0 +1,359 @@
+"""Bootstrap intervals and permutation tests for the X_total/Y_total correlation.
+
+Respondents are resampled as whole (x, y) pairs. Composite scores take few
+distinct values, so the sample is first collapsed to its distinct pairs and
+their frequencies; a resample is then just a vector of pair counts, drawn
+from a multinomial, and a chunk of resamples is a ``(B, K)`` count matrix.
+Pearson r for every row of that matrix comes out of a few matrix-vector
+products, and Spearman r from per-row midranks computed on the sorted
+distinct values, so no resample is ever materialized respondent by
+respondent.
+
+Chunks are sized to stay under ``ANALYZER_BOOTSTRAP_BYTES`` and each gets
+its own child of one ``SeedSequence``, so a given seed reproduces the same
+interval whether the chunks run serially or on a process pool.
+
+The permutation test centres (and for Spearman, ranks) both composites
+once; each permutation of Y is then a single dot product with X, evaluated
+a block at a time, and the test stops as soon as the p-value is clearly on
+one side of alpha.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+
+import numpy as np
+from scipy import stats
+
+from counting import rank_columns
+
+DEFAULT_RESAMPLES = 10_000
+DEFAULT_SEED = 0
+DEFAULT_PERMUTATIONS = 10_000
+# Permutations per block; early stopping is checked between blocks
+PERMUTATION_BLOCK = 500
+# Confidence of the Clopper-Pearson bound used to stop early
+STOP_CONFIDENCE = 0.99
+CI_METHODS = ["bca", "percentile"]
+# Leave-one-out estimates are exact up to this many distinct pairs, grouped beyond it
+JACKKNIFE_MAX = 2000
+# Float64 temporaries per cell of a (resamples x distinct pairs) chunk
+_CELL_BYTES = 8 * 8
+
+
+def bootstrap_bytes():
+    return int(os.environ.get("ANALYZER_BOOTSTRAP_BYTES", 256 * 1024 ** 2))
+
+
+class PairSample:
+    """Distinct (x, y) pairs with their frequencies and per-axis value codes.
+
+    ``weights`` are respondent counts for already aggregated pairs, such as
+    the joint composite counts of an incremental state.
+    """
+
+    def __init__(self, x, y, weights=None):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        keep = ~(np.isnan(x) | np.isnan(y))
+        if weights is None:
+            pairs, self.inverse, self.freq = np.unique(
+                np.column_stack([x[keep], y[keep]]), axis=0, return_inverse=True, return_counts=True
+            )
+            self.inverse = self.inverse.ravel()
+        else:
+            weights = np.asarray(weights, dtype=np.int64)
+            keep &= weights > 0
+            pairs, inverse = np.unique(np.column_stack([x[keep], y[keep]]), axis=0, return_inverse=True)
+            self.freq = np.bincount(inverse.ravel(), weights=weights[keep], minlength=len(pairs)).astype(np.int64)
+            # Built on demand; only the near-distinct draws and grouped jackknife need it
+            self.inverse = None
+        self.n = int(self.freq.sum())
+        self.x, self.y = pairs[:, 0], pairs[:, 1]
+        # Codes into the sorted distinct values of each axis, for midranks
+        self.cx = np.unique(self.x, return_inverse=True)[1].ravel()
+        self.cy = np.unique(self.y, return_inverse=True)[1].ravel()
+
+    @property
+    def k(self):
+        return len(self.freq)
+
+    def respondent_pairs(self):
+        """Distinct-pair index of every respondent."""
+        if self.inverse is None:
+            self.inverse = np.repeat(np.arange(self.k), self.freq)
+        return self.inverse
+
+
+def pearson_rows(W, x, y):
+    """Pearson r of (x, y) weighted by each row of the count matrix ``W``."""
+    x = x - x.mean()
+    y = y - y.mean()
+    n = W.sum(axis=1)
+    sx, sy = W @ x, W @ y
+    sxx, syy, sxy = W @ (x * x), W @ (y * y), W @ (x * y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (n * sxy - sx * sy) / np.sqrt((n * sxx - sx * sx) * (n * syy - sy * sy))
+    return np.clip(r, -1.0, 1.0)
+
+
+def midranks(W, codes):
+    """Average-tie rank of each pair's value in every weighted resample.
+
+    ``codes`` index the sorted distinct values, every one of which occurs,
+    so summing the counts over runs of equal codes gives per-value counts.
+    """
+    order = np.argsort(codes, kind="stable")
+    starts = np.flatnonzero(np.r_[True, np.diff(codes[order]) > 0])
+    counts = np.add.reduceat(W[:, order], starts, axis=1)
+    ranks = np.cumsum(counts, axis=1) - (counts - 1) / 2
+    return ranks[:, codes]
+
+
+def spearman_rows(W, sample):
+    rx = midranks(W, sample.cx)
+    ry = midranks(W, sample.cy)
+    n = W.sum(axis=1, keepdims=True)
+    # Every row's ranks have mean (n + 1) / 2; centre before the products
+    rx -= (n + 1) / 2
+    ry -= (n + 1) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = (W * rx * ry).sum(axis=1) / np.sqrt((W * rx * rx).sum(axis=1) * (W * ry * ry).sum(axis=1))
+    return np.clip(r, -1.0, 1.0)
+
+
+def correlation_rows(W, sample, method):
+    if method == "spearman":
+        return spearman_rows(W, sample)
+    return pearson_rows(W, sample.x, sample.y)
+
+
+def draw_counts(rng, sample, size):
+    """``size`` bootstrap resamples as rows of pair counts."""
+    if sample.k * 4 < sample.n:
+        return rng.multinomial(sample.n, sample.freq / sample.n, size=size).astype(np.float64)
+    # Nearly every respondent is distinct: index draws beat K binomials per row
+    idx = sample.respondent_pairs()[rng.integers(0, sample.n, size=(size, sample.n))]
+    offsets = np.arange(size)[:, None] * sample.k
+    return np.bincount((idx + offsets).ravel(), minlength=size * sample.k).reshape(size, sample.k).astype(np.float64)
+
+
+def _bootstrap_chunk(sample, method, seed, size):
+    return correlation_rows(draw_counts(np.random.default_rng(seed), sample, size), sample, method)
+
+
+def chunk_sizes(total, k, max_bytes=None):
+    max_bytes = bootstrap_bytes() if max_bytes is None else max_bytes
+    return split(total, max_bytes // (_CELL_BYTES * max(k, 1)))
+
+
+def split(total, per_chunk):
+    per_chunk = max(1, min(total, per_chunk))
+    sizes = [per_chunk] * (total // per_chunk)
+    if total % per_chunk:
+        sizes.append(total % per_chunk)
+    return sizes
+
+
+def bootstrap_distribution(sample, method="pearson", resamples=DEFAULT_RESAMPLES, seed=DEFAULT_SEED,
+                           workers=None, max_bytes=None):
+    """Bootstrap replicates of r, computed chunk by chunk."""
+    sizes = chunk_sizes(resamples, sample.k, max_bytes)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers and workers > 1 and len(sizes) > 1:
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            parts = list(pool.map(_bootstrap_chunk, [sample] * len(sizes), [method] * len(sizes), seeds, sizes))
+    else:
+        parts = [_bootstrap_chunk(sample, method, s, size) for s, size in zip(seeds, sizes)]
+    return np.concatenate(parts)
+
+
+def jackknife(sample, method="pearson", max_bytes=None):
+    """Leave-one-out replicates of r and their multiplicities.
+
+    Removing any of the respondents behind one distinct pair gives the same
+    estimate, so only ``K`` replicates are needed. Past ``JACKKNIFE_MAX``
+    distinct pairs, respondents are dropped in that many random groups
+    instead (a delete-d jackknife).
+    """
+    if sample.k <= JACKKNIFE_MAX:
+        drops, weights = np.eye(sample.k), sample.freq.astype(np.float64)
+    else:
+        group = np.random.default_rng(DEFAULT_SEED).integers(0, JACKKNIFE_MAX, sample.n)
+        drops = np.zeros((JACKKNIFE_MAX, sample.k))
+        np.add.at(drops, (group, sample.respondent_pairs()), 1)
+        weights = np.ones(JACKKNIFE_MAX)
+    replicates, start = [], 0
+    for size in chunk_sizes(len(drops), sample.k, max_bytes):
+        W = sample.freq[None, :] - drops[start:start + size]
+        replicates.append(correlation_rows(W, sample, method))
+        start += size
+    return np.concatenate(replicates), weights
+
+
+def bca_levels(boot, estimate, jack, jack_weights, level):
+    """Bias-corrected and accelerated percentile levels (Efron, 1987)."""
+    z0 = stats.norm.ppf(np.mean(boot < estimate) + 0.5 * np.mean(boot == estimate))
+    ok = ~np.isnan(jack)
+    w = jack_weights[ok]
+    if not w.sum() > 0:
+        # No usable leave-one-out estimate (e.g. n = 2): the acceleration is undefined
+        return np.full(2, np.nan)
+    dev = np.average(jack[ok], weights=w) - jack[ok]
+    denom = 6 * np.sum(w * dev ** 2) ** 1.5
+    a = np.sum(w * dev ** 3) / denom if denom > 0 else 0.0
+    z = stats.norm.ppf([(1 - level) / 2, (1 + level) / 2])
+    return stats.norm.cdf(z0 + (z0 + z) / (1 - a * (z0 + z)))
+
+
+def bootstrap_ci(x, y, method="pearson", resamples=DEFAULT_RESAMPLES, level=0.95, ci_method="bca",
+                 seed=DEFAULT_SEED, workers=None, max_bytes=None, weights=None):
+    """Bootstrap confidence interval for Pearson or Spearman r.
+
+    With ``weights``, each (x, y) entry stands for that many respondents.
+    Returns ``{"ci_low", "ci_high", "ci_level", "ci_method", "resamples"}``.
+    BCa falls back to the percentile interval when the bias correction is
+    undefined (e.g. every replicate equals the estimate).
+    """
+    sample = PairSample(x, y, weights)
+    full = correlation_rows(sample.freq[None, :].astype(np.float64), sample, method)[0]
+    boot = bootstrap_distribution(sample, method, resamples, seed, workers, max_bytes)
+    boot = boot[~np.isnan(boot)]
+
+    levels = np.array([(1 - level) / 2, (1 + level) / 2])
+    used = "percentile"
+    if ci_method == "bca" and boot.size:
+        jack, weights = jackknife(sample, method, max_bytes)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bca = bca_levels(boot, full, jack, weights, level)
+        if np.all(np.isfinite(bca)):
+            levels, used = bca, "bca"
+    low, high = np.quantile(boot, levels) if boot.size else (np.nan, np.nan)
+    return {
+        "ci_low": float(low),
+        "ci_high": float(high),
+        "ci_level": level,
+        "ci_method": used,
+        "resamples": int(boot.size),
+    }
+
+
+class PermutationScores:
+    """Unit-norm centred scores (ranks for Spearman) for both composites.
+
+    With X and Y centred and scaled to unit length, r is ``x @ y``. When the
+    composites take few distinct values a permutation is summarized by its
+    X-value by Y-value table instead, whose cells are drawn directly from
+    their multivariate hypergeometric distribution; r is then the table
+    dotted with the outer product of the per-value scores.
+    """
+
+    def __init__(self, x, y, method="pearson"):
+        self.x, self.y = unit_scores(x, method), unit_scores(y, method)
+        self.observed = float(self.x @ self.y)
+        vx, self.row_counts = np.unique(self.x, return_counts=True)
+        vy, self.col_counts = np.unique(self.y, return_counts=True)
+        # Each cell of the table costs about as much as one respondent
+        self.tabular = len(vx) * len(vy) * 8 <= self.x.size
+        self.table_scores = np.outer(vx, vy) if self.tabular else None
+
+    @property
+    def n(self):
+        return self.x.size
+
+
+def unit_scores(values, method):
+    values = rank_columns(values) if method == "spearman" else np.asarray(values, dtype=np.float64)
+    values = values - values.mean()
+    norm = np.sqrt(values @ values)
+    return values / norm if norm > 0 else values
+
+
+def _permutation_block(scores, seed, size):
+    """Correlations for ``size`` random permutations of Y against X."""
+    rng = np.random.default_rng(seed)
+    if not scores.tabular:
+        return rng.permuted(np.broadcast_to(scores.y, (size, scores.n)), axis=1) @ scores.x
+
+    # Fill the table row by row: each X value takes its respondents from the
+    # Y values still unassigned, one hypergeometric draw per cell
+    remaining = np.broadcast_to(scores.col_counts, (size, len(scores.col_counts))).copy()
+    r = np.zeros(size)
+    last = len(scores.row_counts) - 1
+    for g, need in enumerate(scores.row_counts[:last]):
+        need = np.full(size, need)
+        left = remaining.sum(axis=1)
+        for v in range(remaining.shape[1]):
+            left = left - remaining[:, v]
+            take = rng.hypergeometric(remaining[:, v], left, need) if v < remaining.shape[1] - 1 else need
+            remaining[:, v] -= take
+            need = need - take
+            r += take * scores.table_scores[g, v]
+    # Whatever is left belongs to the last X value
+    return r + remaining @ scores.table_scores[last]
+
+
+def resolved(exceed, done, alpha, confidence=STOP_CONFIDENCE):
+    """True once a Clopper-Pearson interval for the p-value excludes ``alpha``."""
+    tail = (1 - confidence) / 2
+    low = stats.beta.ppf(tail, exceed, done - exceed + 1) if exceed else 0.0
+    high = stats.beta.ppf(1 - tail, exceed + 1, done - exceed) if exceed < done else 1.0
+    return high < alpha or low > alpha
+
+
+def permutation_test(x, y, method="pearson", permutations=DEFAULT_PERMUTATIONS, alpha=0.05,
+                     seed=DEFAULT_SEED, workers=None, early_stop=True, max_bytes=None):
+    """Two-sided permutation p-value for Pearson or Spearman r.
+
+    Permutations run in blocks of ``PERMUTATION_BLOCK`` (fewer if permuting
+    a block of respondents would exceed the memory cap); with ``early_stop``
+    the test ends after the first block at which the p-value is resolved
+    relative to ``alpha``. Blocks are seeded by position and checked in
+    order, so the result for a seed does not depend on ``workers``.
+
+    Returns ``{"p_perm", "permutations", "stopped_early"}``.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    keep = ~(np.isnan(x) | np.isnan(y))
+    scores = PermutationScores(x[keep], y[keep], method)
+    # Same tolerance scipy uses, so permutations tying the observed r count
+    threshold = abs(scores.observed) * (1 - 1e-14)
+
+    max_bytes = bootstrap_bytes() if max_bytes is None else max_bytes
+    block = PERMUTATION_BLOCK
+    if not scores.tabular:
+        # The permuted copy of Y plus the product temporaries, 8 bytes each
+        block = min(block, max_bytes // (8 * 2 * max(scores.n, 1)))
+    sizes = split(permutations, block)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    wave = workers if workers and workers > 1 else 1
+    pool = ProcessPoolExecutor(wave, mp_context=multiprocessing.get_context("spawn")) if wave > 1 else None
+
+    exceed = done = 0
+    stopped = False
+    try:
+        for start in range(0, len(sizes), wave):
+            batch = list(zip(seeds[start:start + wave], sizes[start:start + wave]))
+            if pool is not None:
+                parts = pool.map(_permutation_block, [scores] * len(batch), *zip(*batch))
+            else:
+                parts = (_permutation_block(scores, s, size) for s, size in batch)
+            for r in parts:
+                exceed += int(np.count_nonzero(np.abs(r) >= threshold))
+                done += r.size
+                if early_stop and done < permutations and resolved(exceed, done, alpha):
+                    stopped = True
+                    break
+            if stopped:
+                break
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+    return {
+        # Counting the observed labelling keeps the p-value away from 0
+        "p_perm": (exceed + 1) / (done + 1),
+        "permutations": done,
+        "stopped_early": stopped,
+    }
@@ -0,0 +1,266 @@
+"""The descriptive, normality and association analysis repeated per segment.
+
+Segments are the values of one demographic column (region, cohort, ...).
+Descriptives for every variable in every segment come out of one groupby:
+grouped counts, means, minima, maxima and quartiles, plus grouped sums of
+the 2nd-4th powers of the deviations from each segment's mean, which feed
+``engine.moments_frame`` exactly as the in-memory and streaming paths do.
+Pearson r per segment uses the grouped cross-products of the same
+deviations, and Spearman r the same formula on within-segment ranks, so the
+association needs no per-segment loop either. Only the normality test and
+the bootstrap/permutation resampling are run segment by segment; the
+resampling of large segments is spread over a process pool.
+
+    python segments.py survey.csv --x X1 X2 --y Y1 Y2 --by Region
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from correlation import correlation_pvalues
+from engine import (
+    COMPOSITES,
+    AnalysisOptions,
+    association_resampling,
+    build_composites,
+    corr_strength,
+    describe_records,
+    moments_frame,
+    normality_test,
+    read_table,
+)
+
+MISSING_LABEL = "(missing)"
+# Segments smaller than this get descriptives but no resampling
+MIN_SEGMENT_N = 10
+# Resampling runs on a process pool when at least two segments are this large
+PARALLEL_MIN_ROWS = 20_000
+
+COMPARISON_COLUMNS = [
+    "Segment", "n", "X_total Mean", "X_total SD", "Y_total Mean", "Y_total SD",
+    "X_total normality p", "Y_total normality p", "Method", "r", "p-value", "Strength", "Direction",
+]
+
+
+def segment_workers():
+    return int(os.environ.get("ANALYZER_SEGMENT_WORKERS", min(4, os.cpu_count() or 1)))
+
+
+@dataclass
+class SegmentResult:
+    by: str
+    options: AnalysisOptions
+    data: pd.DataFrame
+    segments: list = field(default_factory=list)
+    describe: pd.DataFrame = None
+    descriptives: dict = field(default_factory=dict)
+    normality_tests: dict = field(default_factory=dict)
+    associations: dict = field(default_factory=dict)
+    comparison: pd.DataFrame = None
+
+    @property
+    def nbytes(self):
+        frames = [self.data, self.describe, self.comparison]
+        return sum(int(f.memory_usage(deep=True).sum()) for f in frames if f is not None)
+
+    def summary(self):
+        return {
+            "by": self.by,
+            "segments": [str(s) for s in self.segments],
+            "comparison": self.comparison.to_dict(orient="records"),
+        }
+
+
+def segment_labels(series):
+    """Segment key for every row, with missing values grouped as their own segment."""
+    return series.astype(object).where(series.notna(), MISSING_LABEL).rename("Segment")
+
+
+def grouped_describe(data, key, columns):
+    """``describe_matrix`` for every (segment, column) pair from one groupby.
+
+    Returns the descriptive table indexed by ``(Segment, Variable)``.
+    """
+    values = data[columns].astype(np.float64)
+    grouped = values.groupby(key, sort=True)
+    n = grouped.count()
+    mean = grouped.mean()
+    dev = values - grouped.transform("mean")
+    dev2 = dev * dev
+    m2 = dev2.groupby(key, sort=True).sum()
+    m3 = (dev2 * dev).groupby(key, sort=True).sum()
+    m4 = (dev2 * dev2).groupby(key, sort=True).sum()
+    segments = list(n.index)
+
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).to_numpy()
+    quartiles = quartiles.reshape(len(segments), 3, len(columns)).transpose(1, 0, 2).reshape(3, -1)
+
+    def flat(frame):
+        return frame.to_numpy(dtype=np.float64).ravel()
+
+    pairs = [(s, c) for s in segments for c in columns]
+    table = moments_frame(range(len(pairs)), flat(n).astype(np.int64), flat(mean), flat(m2), flat(m3),
+                          flat(m4), flat(grouped.min()), flat(grouped.max()), quartiles)
+    table.index = pd.MultiIndex.from_tuples(pairs, names=["Segment", "Variable"])
+    return table
+
+
+def grouped_correlation(x, y, key):
+    """Pearson r and pair counts of ``x`` and ``y`` within every segment."""
+    frame = pd.DataFrame({"x": x, "y": y}).dropna()
+    key = key.loc[frame.index]
+    dev = frame - frame.groupby(key, sort=True).transform("mean")
+    sums = pd.DataFrame({
+        "xy": dev["x"] * dev["y"], "xx": dev["x"] ** 2, "yy": dev["y"] ** 2,
+    }).groupby(key, sort=True).sum()
+    n = frame.groupby(key, sort=True).size()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = sums["xy"] / np.sqrt(sums["xx"] * sums["yy"])
+    return r.clip(-1.0, 1.0), n
+
+
+def grouped_associations(data, key, normal):
+    """Per-segment association records, Pearson or Spearman by the normality rule."""
+    x, y = data["X_total"].astype(np.float64), data["Y_total"].astype(np.float64)
+    pearson_r, n = grouped_correlation(x, y, key)
+    ranks = pd.DataFrame({"x": x, "y": y}).dropna().groupby(key, sort=True).rank()
+    spearman_r, _ = grouped_correlation(ranks["x"], ranks["y"], key)
+
+    out = {}
+    for segment in n.index:
+        pearson = normal[segment]
+        r = float(pearson_r[segment] if pearson else spearman_r[segment])
+        p = float(correlation_pvalues(np.float64(r), np.int64(n[segment])))
+        out[segment] = {
+            "method": "Pearson Correlation" if pearson else "Spearman Rank Correlation",
+            "n": int(n[segment]),
+            "r": r,
+            "p": p,
+            "strength": corr_strength(r) if np.isfinite(r) else "-",
+            "direction": ("Positive" if r > 0 else "Negative") if np.isfinite(r) else "-",
+        }
+    return out
+
+
+def _segment_resampling(x, y, association, options):
+    return association_resampling(x, y, association, options)
+
+
+def segment_resampling(data, key, associations, options, workers=None):
+    """Bootstrap CI / permutation entries per segment, large segments on a pool."""
+    if not (options.resamples or options.permutations):
+        return {}
+    jobs = []
+    for segment, assoc in associations.items():
+        if assoc["n"] < MIN_SEGMENT_N or not np.isfinite(assoc["r"]):
+            continue
+        rows = data.loc[(key == segment).to_numpy(), COMPOSITES].dropna()
+        jobs.append((segment, rows["X_total"].to_numpy(np.float64), rows["Y_total"].to_numpy(np.float64), assoc))
+
+    workers = segment_workers() if workers is None else workers
+    large = sum(len(x) >= PARALLEL_MIN_ROWS for _, x, _, _ in jobs)
+    if workers > 1 and large >= 2:
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            parts = list(pool.map(_segment_resampling, *zip(*[(x, y, a, options) for _, x, y, a in jobs])))
+    else:
+        parts = [_segment_resampling(x, y, a, options) for _, x, y, a in jobs]
+    return {segment: part for (segment, _, _, _), part in zip(jobs, parts)}
+
+
+def comparison_table(result):
+    """One row per segment with the composites' descriptives, normality and association."""
+    rows = []
+    for segment in result.segments:
+        desc = result.descriptives[segment]
+        tests = result.normality_tests[segment]
+        assoc = result.associations.get(segment, {})
+        rows.append({
+            "Segment": str(segment),
+            "n": assoc.get("n", desc["X_total"]["Count"]),
+            "X_total Mean": desc["X_total"]["Mean"],
+            "X_total SD": desc["X_total"]["Std Deviation"],
+            "Y_total Mean": desc["Y_total"]["Mean"],
+            "Y_total SD": desc["Y_total"]["Std Deviation"],
+            "X_total normality p": tests["X_total"]["p"],
+            "Y_total normality p": tests["Y_total"]["p"],
+            "Method": assoc.get("method", "-"),
+            "r": assoc.get("r", np.nan),
+            "p-value": assoc.get("p", np.nan),
+            "Strength": assoc.get("strength", "-"),
+            "Direction": assoc.get("direction", "-"),
+            "CI low": assoc.get("ci_low", np.nan),
+            "CI high": assoc.get("ci_high", np.nan),
+            "Permutation p": assoc.get("p_perm", np.nan),
+        })
+    table = pd.DataFrame(rows)
+    extra = [c for c in ["CI low", "CI high", "Permutation p"] if table[c].notna().any()]
+    return table[COMPARISON_COLUMNS + extra]
+
+
+def analyze_segments(df, x_items, y_items, by, options=None, totals=None, workers=None):
+    """Descriptives, normality and the X_total/Y_total association per value of ``by``.
+
+    ``totals`` may carry precomputed composites (e.g. from ``cache.composites``).
+    """
+    options = options or AnalysisOptions()
+    x_items, y_items = list(x_items), list(y_items)
+    if not x_items or not y_items:
+        raise ValueError("Segmented analysis needs both X and Y items")
+    if totals is None:
+        totals = build_composites(df, x_items, y_items)
+    data = pd.concat([df[list(dict.fromkeys(x_items + y_items))], totals], axis=1)
+    key = segment_labels(df[by])
+
+    result = SegmentResult(by=by, options=options, data=data.assign(**{by: key}))
+    numeric = [c for c in data.columns if pd.api.types.is_numeric_dtype(data[c])]
+    result.describe = grouped_describe(data, key, numeric)
+    result.segments = list(result.describe.index.unique("Segment"))
+    for segment in result.segments:
+        result.descriptives[segment] = describe_records(result.describe.loc[segment])
+
+    # Shapiro-Wilk needs the raw values, so this step is per segment
+    groups = data[COMPOSITES].groupby(key, sort=True)
+    normal = {}
+    for segment, block in groups:
+        moments = result.describe.loc[segment]
+        tests = {col: normality_test(block[col], moments.loc[col], options.normality_test) for col in COMPOSITES}
+        result.normality_tests[segment] = tests
+        normal[segment] = all(t["p"] > options.alpha for t in tests.values())
+
+    result.associations = grouped_associations(data, key, normal)
+    for segment, extra in segment_resampling(data, key, result.associations, options, workers).items():
+        result.associations[segment].update(extra)
+    result.comparison = comparison_table(result)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Descriptive & association analysis per segment")
+    parser.add_argument("path", help="CSV or Excel file")
+    parser.add_argument("--x", nargs="+", required=True, help="X item columns")
+    parser.add_argument("--y", nargs="+", required=True, help="Y item columns")
+    parser.add_argument("--by", required=True, help="demographic column to split by")
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--resamples", type=int, default=0,
+                        help="bootstrap resamples for each segment's correlation CI")
+    parser.add_argument("--csv", help="write the comparison table to this CSV file instead of JSON to stdout")
+    args = parser.parse_args(argv)
+
+    options = AnalysisOptions(alpha=args.alpha, resamples=args.resamples)
+    result = analyze_segments(read_table(args.path), args.x, args.y, args.by, options)
+    if args.csv:
+        result.comparison.to_csv(args.csv, index=False)
+        return
+    json.dump(result.summary(), sys.stdout, indent=2, default=str)
+    sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
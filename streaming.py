@@ -0,0 +1,282 @@
+"""Chunked CSV analysis for files larger than memory.
+
+Only the selected item columns are read, ``chunksize`` rows at a time. Each
+chunk updates running moments, per-value counts and the composite scores,
+and is then dropped, so the item table is never materialized. The only
+per-row state kept is the two composite columns (16 bytes per respondent),
+which the normality test and rank correlation need in full.
+"""
+import numpy as np
+import pandas as pd
+
+from engine import (
+    COMPOSITES,
+    AnalysisOptions,
+    AnalysisResult,
+    associate,
+    association_resampling,
+    build_composites,
+    describe_matrix,
+    describe_records,
+    freq_from_counts,
+    freq_tables,
+    is_likert,
+    moments_frame,
+    normality_pvalues,
+    normality_tests,
+    scales,
+)
+from instrument import traced
+from reliability import reliability_from_cov
+from sufficient import PairStats
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+def quantiles_from_counts(values, counts, qs):
+    """Linear-interpolated quantiles (numpy's default) from a sorted value histogram."""
+    n = counts.sum()
+    if n == 0:
+        return np.full(len(qs), np.nan)
+    cum = np.cumsum(counts)
+    h = np.asarray(qs, dtype=np.float64) * (n - 1)
+    lo = values[np.searchsorted(cum, np.floor(h), side="right")]
+    hi = values[np.searchsorted(cum, np.ceil(h), side="right")]
+    return lo + (hi - lo) * (h - np.floor(h))
+
+
+class MomentAccumulator:
+    """Running count/mean/central moments/min/max for ``k`` columns.
+
+    Chunks are folded in with the pairwise update of Chan et al. extended to
+    third and fourth moments (Pébay, 2008), so merging is exact up to
+    floating-point rounding and independent of chunk boundaries.
+    """
+
+    def __init__(self, k):
+        self.n = np.zeros(k, dtype=np.int64)
+        self.mean = np.zeros(k)
+        self.m2 = np.zeros(k)
+        self.m3 = np.zeros(k)
+        self.m4 = np.zeros(k)
+        self.min = np.full(k, np.inf)
+        self.max = np.full(k, -np.inf)
+
+    @classmethod
+    def from_matrix(cls, X):
+        acc = cls(X.shape[1])
+        mask = ~np.isnan(X)
+        acc.n = mask.sum(axis=0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            acc.mean = np.where(acc.n > 0, np.where(mask, X, 0.0).sum(axis=0) / acc.n, 0.0)
+        dev = np.where(mask, X - acc.mean, 0.0)
+        dev2 = dev * dev
+        acc.m2 = dev2.sum(axis=0)
+        acc.m3 = (dev2 * dev).sum(axis=0)
+        acc.m4 = (dev2 * dev2).sum(axis=0)
+        acc.min = np.where(mask, X, np.inf).min(axis=0, initial=np.inf)
+        acc.max = np.where(mask, X, -np.inf).max(axis=0, initial=-np.inf)
+        return acc
+
+    def update(self, X):
+        self.merge(MomentAccumulator.from_matrix(np.asarray(X, dtype=np.float64)))
+        return self
+
+    def merge(self, other):
+        na, nb = self.n.astype(np.float64), other.n.astype(np.float64)
+        n = na + nb
+        safe = np.where(n > 0, n, 1.0)
+        d = other.mean - self.mean
+        d2 = d * d
+
+        mean = self.mean + d * nb / safe
+        m2 = self.m2 + other.m2 + d2 * na * nb / safe
+        m3 = (self.m3 + other.m3
+              + d2 * d * na * nb * (na - nb) / safe ** 2
+              + 3 * d * (na * other.m2 - nb * self.m2) / safe)
+        m4 = (self.m4 + other.m4
+              + d2 * d2 * na * nb * (na * na - na * nb + nb * nb) / safe ** 3
+              + 6 * d2 * (na * na * other.m2 + nb * nb * self.m2) / safe ** 2
+              + 4 * d * (na * other.m3 - nb * self.m3) / safe)
+
+        self.n = self.n + other.n
+        self.mean, self.m2, self.m3, self.m4 = mean, m2, m3, m4
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        return self
+
+
+class CovarianceAccumulator:
+    """Running mean and co-moment matrix over rows with every column present.
+
+    Chunks merge with the matrix form of Chan et al.'s update, so the
+    covariance is exact regardless of chunk boundaries.
+    """
+
+    def __init__(self, k):
+        self.n = 0
+        self.mean = np.zeros(k)
+        self.comoment = np.zeros((k, k))
+
+    def update(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        X = X[~np.isnan(X).any(axis=1)]
+        nb = X.shape[0]
+        if nb == 0:
+            return self
+        mean_b = X.mean(axis=0)
+        dev = X - mean_b
+        n = self.n + nb
+        d = mean_b - self.mean
+        self.comoment += dev.T @ dev + np.outer(d, d) * self.n * nb / n
+        self.mean += d * nb / n
+        self.n = n
+        return self
+
+    @property
+    def cov(self):
+        k = len(self.mean)
+        return self.comoment / (self.n - 1) if self.n > 1 else np.full((k, k), np.nan)
+
+
+class ValueCounter:
+    """Per-column value counts (NaN included) merged across chunks.
+
+    Chunks are typed independently by ``read_csv``, so the same answer can
+    arrive as ``2``, ``2.0`` or ``"2"``; ``value_counts`` re-keys the merged
+    counts the way a single full read would have typed the column.
+    """
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.counts = {c: pd.Series(dtype=np.int64) for c in self.columns}
+        self.numeric = dict.fromkeys(self.columns, True)
+        self.integer = dict.fromkeys(self.columns, True)
+        self.rows = 0
+
+    def update(self, frame):
+        self.rows += len(frame)
+        for c in self.columns:
+            series = frame[c]
+            self.numeric[c] = self.numeric[c] and pd.api.types.is_numeric_dtype(series)
+            self.integer[c] = self.integer[c] and pd.api.types.is_integer_dtype(series)
+            vc = series.value_counts(dropna=False)
+            self.counts[c] = self.counts[c].add(vc, fill_value=0).astype(np.int64)
+        return self
+
+    def value_counts(self, col):
+        vc = self.counts[col]
+        if self.numeric[col]:
+            keys = pd.to_numeric(pd.Series(vc.index, dtype=object), errors="coerce")
+            if self.integer[col]:
+                keys = keys.astype(np.int64)
+        else:
+            keys = pd.Series([_as_text(v) for v in vc.index], dtype=object)
+        merged = pd.Series(vc.to_numpy()).groupby(keys.to_numpy(), dropna=False).sum()
+        return merged.sort_values(ascending=False, kind="stable")
+
+    def numeric_histogram(self, col):
+        """Sorted (values, counts) over the numeric, non-missing entries."""
+        vc = self.value_counts(col)
+        values = pd.to_numeric(pd.Series(vc.index, dtype=object), errors="coerce").to_numpy(dtype=np.float64)
+        keep = ~np.isnan(values)
+        order = np.argsort(values[keep], kind="stable")
+        return values[keep][order], vc.to_numpy()[keep][order]
+
+    def freq_table(self, col):
+        return freq_from_counts(self.value_counts(col), self.rows)
+
+
+def _as_text(value):
+    # Integral floats only appear because a chunk had missing values
+    if isinstance(value, float):
+        if np.isnan(value):
+            return value
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+
+def iter_chunks(source, columns, chunksize=DEFAULT_CHUNKSIZE):
+    return pd.read_csv(source, usecols=columns, chunksize=chunksize)
+
+
+@traced("stream")
+def stream_analyze(source, x_items, y_items, options=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Same result as ``engine.analyze`` without loading the whole CSV.
+
+    ``result.data`` holds only the composite columns; item-level results are
+    available through ``describe``, ``descriptives``, ``frequencies`` and
+    ``likert``. Medians and quartiles are exact, derived from the value
+    counts, which stay small for Likert items and integer composites.
+    """
+    options = options or AnalysisOptions()
+    x_items, y_items = list(x_items), list(y_items)
+    items = list(dict.fromkeys(x_items + y_items))
+
+    moments = MomentAccumulator(len(items))
+    counter = ValueCounter(items)
+    covariances = {name: CovarianceAccumulator(len(cols)) for name, cols in scales(x_items, y_items).items()}
+    total_parts = []
+
+    for chunk in iter_chunks(source, items, chunksize):
+        chunk = chunk[items]
+        counter.update(chunk)
+        numeric = chunk.apply(pd.to_numeric, errors="coerce")
+        moments.update(numeric.to_numpy(dtype=np.float64, na_value=np.nan))
+        for name, acc in covariances.items():
+            cols = x_items if name == "X_total" else y_items
+            acc.update(numeric[cols].to_numpy(dtype=np.float64, na_value=np.nan))
+        if options.create_total:
+            total_parts.append(build_composites(chunk, x_items, y_items, numeric))
+
+    data = pd.concat(total_parts, ignore_index=True) if total_parts else pd.DataFrame()
+    result = AnalysisResult(data=data, x_items=x_items, y_items=y_items, options=options,
+                            rows=counter.rows)
+    result.variables = x_items + y_items + [c for c in COMPOSITES if c in data.columns]
+
+    # Items come from the accumulators; the composites are in memory already
+    numeric_items = [c for c in items if counter.numeric[c]]
+    result.describe = pd.concat([
+        item_describe(numeric_items, moments, [items.index(c) for c in numeric_items], counter),
+        describe_matrix(data, list(data.columns)),
+    ])
+    result.descriptives = describe_records(result.describe)
+
+    for c in items:
+        result.frequencies[c] = counter.freq_table(c)
+        if c in result.descriptives:
+            values, _ = counter.numeric_histogram(c)
+            result.likert[c] = bool(np.isin(values, [1, 2, 3, 4, 5]).all())
+    result.frequencies.update(freq_tables(data, list(data.columns)))
+    for c in data.columns:
+        result.likert[c] = is_likert(data[c])
+
+    for name, acc in covariances.items():
+        cols = x_items if name == "X_total" else y_items
+        result.reliability[name] = reliability_from_cov(acc.cov, acc.n, cols, name)
+
+    result.normality_tests = normality_tests(data, result.describe, options.normality_test)
+    result.normality = normality_pvalues(result.normality_tests)
+    if all(c in data.columns for c in COMPOSITES):
+        result.pair_stats = PairStats.from_arrays(data["X_total"], data["Y_total"])
+        result.association = associate(
+            data["X_total"], data["Y_total"], result.normality, options.alpha, result.pair_stats
+        )
+        result.association.update(
+            association_resampling(data["X_total"], data["Y_total"], result.association, options)
+        )
+    return result
+
+
+def item_describe(columns, moments, idx, counter):
+    """Descriptive table for accumulated columns, quartiles from the value counts."""
+    quartiles = np.empty((3, len(columns)))
+    for j, c in enumerate(columns):
+        quartiles[:, j] = quantiles_from_counts(*counter.numeric_histogram(c), [0.25, 0.5, 0.75])
+    n = moments.n[idx]
+    return moments_frame(
+        columns, n, moments.mean[idx], moments.m2[idx], moments.m3[idx], moments.m4[idx],
+        np.where(n > 0, moments.min[idx], np.nan), np.where(n > 0, moments.max[idx], np.nan),
+        quartiles,
+    )
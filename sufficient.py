@@ -0,0 +1,113 @@
+"""Sufficient statistics of the X_total/Y_total pair.
+
+Pearson r, its p-value, the least-squares slope and intercept and the PDF
+trend line are all functions of the same few numbers: the count, the two
+means and the centred sums of squares and cross-products over the rows
+where both composites are present. ``PairStats`` reduces the pair to those
+numbers once, in one pass, and every consumer reads them from there, so r
+and the trend line always describe the same respondents.
+
+Two ``PairStats`` merge exactly (Chan et al.'s pairwise update), so chunks
+or batches of respondents can be reduced separately and combined.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from correlation import correlation_pvalues
+
+
+@dataclass
+class PairStats:
+    n: int = 0
+    mean_x: float = 0.0
+    mean_y: float = 0.0
+    # Centred sums of squares and cross-products
+    sxx: float = 0.0
+    syy: float = 0.0
+    sxy: float = 0.0
+    min_x: float = np.inf
+    max_x: float = -np.inf
+
+    @classmethod
+    def from_arrays(cls, x, y):
+        """Reduce the pairwise-complete rows of ``x`` and ``y``."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        keep = ~(np.isnan(x) | np.isnan(y))
+        if not keep.all():
+            x, y = x[keep], y[keep]
+        n = x.size
+        if n == 0:
+            return cls()
+        mean_x, mean_y = x.mean(), y.mean()
+        dx, dy = x - mean_x, y - mean_y
+        return cls(n=n, mean_x=float(mean_x), mean_y=float(mean_y),
+                   sxx=float(dx @ dx), syy=float(dy @ dy), sxy=float(dx @ dy),
+                   min_x=float(x.min()), max_x=float(x.max()))
+
+    @classmethod
+    def from_counts(cls, x, y, counts):
+        """Reduce distinct ``(x, y)`` pairs observed ``counts`` times each."""
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        w = np.asarray(counts, dtype=np.float64)
+        keep = ~(np.isnan(x) | np.isnan(y)) & (w > 0)
+        x, y, w = x[keep], y[keep], w[keep]
+        n = int(w.sum())
+        if n == 0:
+            return cls()
+        mean_x, mean_y = (w @ x) / n, (w @ y) / n
+        dx, dy = x - mean_x, y - mean_y
+        return cls(n=n, mean_x=float(mean_x), mean_y=float(mean_y),
+                   sxx=float(w @ (dx * dx)), syy=float(w @ (dy * dy)), sxy=float(w @ (dx * dy)),
+                   min_x=float(x.min()), max_x=float(x.max()))
+
+    def merge(self, other):
+        n = self.n + other.n
+        if n == 0:
+            return self
+        dx, dy = other.mean_x - self.mean_x, other.mean_y - self.mean_y
+        w = self.n * other.n / n
+        self.sxx += other.sxx + dx * dx * w
+        self.syy += other.syy + dy * dy * w
+        self.sxy += other.sxy + dx * dy * w
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.min_x, self.max_x = min(self.min_x, other.min_x), max(self.max_x, other.max_x)
+        self.n = n
+        return self
+
+    @property
+    def var_x(self):
+        return self.sxx / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def var_y(self):
+        return self.syy / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def cov(self):
+        return self.sxy / (self.n - 1) if self.n > 1 else np.nan
+
+    @property
+    def r(self):
+        denom = np.sqrt(self.sxx * self.syy)
+        return float(np.clip(self.sxy / denom, -1.0, 1.0)) if denom > 0 else np.nan
+
+    def pearson(self):
+        """``(r, p)`` with the two-sided t-test p-value ``pearsonr`` reports."""
+        r = self.r
+        return r, float(correlation_pvalues(np.float64(r), np.int64(self.n)))
+
+    @property
+    def slope(self):
+        return self.sxy / self.sxx if self.sxx > 0 else np.nan
+
+    @property
+    def intercept(self):
+        return self.mean_y - self.slope * self.mean_x
+
+    def trend(self):
+        """Least-squares line of Y on X as ``np.polyfit(x, y, 1)`` coefficients."""
+        return np.array([self.slope, self.intercept])